@@ -0,0 +1,1320 @@
+-- =====================================================================
+-- UC3 - Customer Complaints & Sentiment Analysis
+-- Analytics Pipelines: Anomalies, Forecasting, Segmentation, Sketches & Percentiles
+-- =====================================================================
+-- Purpose: Incremental rollups, anomaly scores, forecasts, customer segments,
+--          daily HyperLogLog sketches for unique-customer counts and t-digest
+--          states for resolution/handle/wait time percentiles
+-- Prerequisite: Run create_sentiment_models.sql first
+-- Execution: Run in Snowflake UI (Worksheets) with "Run All"
+-- Time: ~2-5 minutes
+-- =====================================================================
+
+USE ROLE SYSADMIN;
+USE WAREHOUSE COMPUTE_WH;
+USE DATABASE UC3_CUSTOMER_COMPLAINTS;
+
+-- =====================================================================
+-- SECTION 1: ROLLUP & ANOMALY TABLES
+-- =====================================================================
+
+USE SCHEMA ANALYTICS;
+
+SELECT 'Creating rollup and anomaly tables...' as STATUS;
+
+-- Hourly complaint counts per channel x category (incremented as complaints arrive)
+CREATE TABLE IF NOT EXISTS HOURLY_COMPLAINT_ROLLUP (
+    BUCKET_HOUR TIMESTAMP_NTZ NOT NULL,
+    CHANNEL VARCHAR(20) NOT NULL,
+    CATEGORY VARCHAR(100) NOT NULL,
+    COMPLAINT_COUNT INT NOT NULL,
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (BUCKET_HOUR, CHANNEL, CATEGORY)
+)
+CLUSTER BY (BUCKET_HOUR)
+COMMENT = 'Hourly complaint volume by channel and category';
+
+-- Latest robust baseline per seasonal slot (weekday x hour x channel x category)
+CREATE TABLE IF NOT EXISTS ANOMALY_BASELINE (
+    WEEKDAY INT NOT NULL, -- 1 = Monday ... 7 = Sunday
+    HOUR_OF_DAY INT NOT NULL,
+    CHANNEL VARCHAR(20) NOT NULL,
+    CATEGORY VARCHAR(100) NOT NULL,
+    BASELINE_MEDIAN FLOAT,
+    BASELINE_MAD FLOAT, -- Median absolute deviation
+    HISTORY_WEEKS INT, -- Same-slot weeks available (max 8)
+    LAST_BUCKET_HOUR TIMESTAMP_NTZ,
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (WEEKDAY, HOUR_OF_DAY, CHANNEL, CATEGORY)
+) COMMENT = 'Rolling seasonal median/MAD baselines for anomaly scoring';
+
+-- One score per completed hourly bucket of each live series (empty hours score as zero)
+CREATE TABLE IF NOT EXISTS COMPLAINT_ANOMALY_SCORE (
+    BUCKET_HOUR TIMESTAMP_NTZ NOT NULL,
+    CHANNEL VARCHAR(20) NOT NULL,
+    CATEGORY VARCHAR(100) NOT NULL,
+    OBSERVED_COUNT INT,
+    BASELINE_MEDIAN FLOAT,
+    BASELINE_MAD FLOAT,
+    ROBUST_Z FLOAT, -- (observed - median) / (1.4826 * MAD)
+    IS_ANOMALY BOOLEAN,
+    HISTORY_WEEKS INT,
+    SCORED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (BUCKET_HOUR, CHANNEL, CATEGORY)
+)
+CLUSTER BY (BUCKET_HOUR)
+COMMENT = 'Seasonality-aware anomaly scores per hourly bucket';
+
+-- =====================================================================
+-- SECTION 2: ANOMALY PROCEDURE
+-- =====================================================================
+
+SELECT 'Creating anomaly detection procedure...' as STATUS;
+
+-- Procedure to fold new complaints into the hourly rollup and score new buckets
+-- Each completed hour is compared with the same weekday/hour over the trailing
+-- 8 weeks (missing weeks count as zero once the series has started).
+-- Scored each run: every completed hour after the last scored hour, densified
+-- against an hour spine so empty hours score as zero (volume drops show up),
+-- plus any earlier hour that late or backfilled complaints landed in (rescored).
+CREATE OR REPLACE PROCEDURE UPDATE_COMPLAINT_ANOMALIES(Z_THRESHOLD FLOAT DEFAULT 3.5)
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  new_complaints INT;
+  watermark TIMESTAMP_NTZ;
+  spine_start TIMESTAMP_NTZ;
+  buckets_scored INT;
+  anomalies_found INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS ANOMALY_COMPLAINT_BATCH (
+    BUCKET_HOUR TIMESTAMP_NTZ,
+    CHANNEL VARCHAR(20),
+    CATEGORY VARCHAR(100),
+    COMPLAINT_COUNT INT
+  );
+  TRUNCATE TABLE ANOMALY_COMPLAINT_BATCH;
+
+  BEGIN TRANSACTION;
+
+  -- Drain and rollup MERGE commit together so a failed MERGE leaves the stream offset unmoved
+  INSERT INTO ANOMALY_COMPLAINT_BATCH
+  SELECT
+    DATE_TRUNC('hour', COMPLAINT_TIMESTAMP),
+    CHANNEL,
+    COALESCE(CATEGORY, 'Unknown'),
+    COUNT(*)
+  FROM COMPLAINTS.UNIFIED_COMPLAINT_ROLLUP_STREAM
+  WHERE METADATA$ACTION = 'INSERT'
+  GROUP BY 1, 2, 3;
+
+  new_complaints := (SELECT COALESCE(SUM(COMPLAINT_COUNT), 0) FROM ANOMALY_COMPLAINT_BATCH);
+
+  MERGE INTO ANALYTICS.HOURLY_COMPLAINT_ROLLUP t
+  USING ANOMALY_COMPLAINT_BATCH s
+  ON t.BUCKET_HOUR = s.BUCKET_HOUR AND t.CHANNEL = s.CHANNEL AND t.CATEGORY = s.CATEGORY
+  WHEN MATCHED THEN UPDATE SET
+    COMPLAINT_COUNT = t.COMPLAINT_COUNT + s.COMPLAINT_COUNT,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (BUCKET_HOUR, CHANNEL, CATEGORY, COMPLAINT_COUNT, UPDATED_AT)
+  VALUES (s.BUCKET_HOUR, s.CHANNEL, s.CATEGORY, s.COMPLAINT_COUNT, CURRENT_TIMESTAMP());
+
+  COMMIT;
+
+  watermark := (SELECT COALESCE(MAX(BUCKET_HOUR), '1970-01-01'::TIMESTAMP_NTZ) FROM ANALYTICS.COMPLAINT_ANOMALY_SCORE);
+  spine_start := (SELECT GREATEST(:watermark, COALESCE(DATEADD(hour, -1, MIN(BUCKET_HOUR)), :watermark))
+                  FROM ANALYTICS.HOURLY_COMPLAINT_ROLLUP);
+
+  -- Buckets to score: dense unscored hours per live series + completed hours touched by this batch.
+  -- A series stays live for 8 weeks after its last complaint so its zero hours are scored too.
+  CREATE TEMPORARY TABLE IF NOT EXISTS ANOMALY_TARGET_BUCKET (
+    BUCKET_HOUR TIMESTAMP_NTZ,
+    CHANNEL VARCHAR(20),
+    CATEGORY VARCHAR(100),
+    COMPLAINT_COUNT INT
+  );
+  TRUNCATE TABLE ANOMALY_TARGET_BUCKET;
+
+  INSERT INTO ANOMALY_TARGET_BUCKET
+  WITH series AS (
+    SELECT CHANNEL, CATEGORY, MIN(BUCKET_HOUR) as FIRST_HOUR, MAX(BUCKET_HOUR) as LAST_HOUR
+    FROM ANALYTICS.HOURLY_COMPLAINT_ROLLUP
+    GROUP BY CHANNEL, CATEGORY
+  ),
+  spine AS (
+    SELECT DATEADD(hour, ROW_NUMBER() OVER (ORDER BY SEQ4()), :spine_start) as BUCKET_HOUR
+    FROM TABLE(GENERATOR(ROWCOUNT => 100000)) -- ~11 years of hours, trimmed below
+  ),
+  targets AS (
+    SELECT sp.BUCKET_HOUR, se.CHANNEL, se.CATEGORY
+    FROM spine sp
+    JOIN series se
+      ON sp.BUCKET_HOUR BETWEEN se.FIRST_HOUR AND DATEADD(week, 8, se.LAST_HOUR)
+    WHERE sp.BUCKET_HOUR < DATE_TRUNC('hour', CURRENT_TIMESTAMP())
+    UNION
+    SELECT BUCKET_HOUR, CHANNEL, CATEGORY
+    FROM ANOMALY_COMPLAINT_BATCH
+    WHERE BUCKET_HOUR < DATE_TRUNC('hour', CURRENT_TIMESTAMP())
+  )
+  SELECT t.BUCKET_HOUR, t.CHANNEL, t.CATEGORY, COALESCE(r.COMPLAINT_COUNT, 0)
+  FROM targets t
+  LEFT JOIN ANALYTICS.HOURLY_COMPLAINT_ROLLUP r
+    ON r.BUCKET_HOUR = t.BUCKET_HOUR AND r.CHANNEL = t.CHANNEL AND r.CATEGORY = t.CATEGORY;
+
+  -- Score the target buckets against their seasonal history
+  CREATE TEMPORARY TABLE IF NOT EXISTS ANOMALY_SCORE_BATCH (
+    BUCKET_HOUR TIMESTAMP_NTZ,
+    CHANNEL VARCHAR(20),
+    CATEGORY VARCHAR(100),
+    OBSERVED_COUNT INT,
+    BASELINE_MEDIAN FLOAT,
+    BASELINE_MAD FLOAT,
+    HISTORY_WEEKS INT
+  );
+  TRUNCATE TABLE ANOMALY_SCORE_BATCH;
+
+  INSERT INTO ANOMALY_SCORE_BATCH
+  WITH new_buckets AS (
+    SELECT BUCKET_HOUR, CHANNEL, CATEGORY, COMPLAINT_COUNT
+    FROM ANOMALY_TARGET_BUCKET
+  ),
+  series_start AS (
+    SELECT CHANNEL, CATEGORY, MIN(BUCKET_HOUR) as FIRST_HOUR
+    FROM ANALYTICS.HOURLY_COMPLAINT_ROLLUP
+    GROUP BY CHANNEL, CATEGORY
+  ),
+  history AS (
+    SELECT
+      n.BUCKET_HOUR,
+      n.CHANNEL,
+      n.CATEGORY,
+      COALESCE(h.COMPLAINT_COUNT, 0) as PAST_COUNT
+    FROM new_buckets n
+    JOIN series_start ss ON ss.CHANNEL = n.CHANNEL AND ss.CATEGORY = n.CATEGORY
+    CROSS JOIN (
+      SELECT ROW_NUMBER() OVER (ORDER BY SEQ4()) as WEEKS_BACK
+      FROM TABLE(GENERATOR(ROWCOUNT => 8))
+    ) w
+    LEFT JOIN ANALYTICS.HOURLY_COMPLAINT_ROLLUP h
+      ON h.BUCKET_HOUR = DATEADD(week, -w.WEEKS_BACK, n.BUCKET_HOUR)
+      AND h.CHANNEL = n.CHANNEL
+      AND h.CATEGORY = n.CATEGORY
+    WHERE DATEADD(week, -w.WEEKS_BACK, n.BUCKET_HOUR) >= ss.FIRST_HOUR
+  ),
+  medians AS (
+    SELECT BUCKET_HOUR, CHANNEL, CATEGORY, MEDIAN(PAST_COUNT) as BASELINE_MEDIAN, COUNT(*) as HISTORY_WEEKS
+    FROM history
+    GROUP BY BUCKET_HOUR, CHANNEL, CATEGORY
+  ),
+  mads AS (
+    SELECT h.BUCKET_HOUR, h.CHANNEL, h.CATEGORY, MEDIAN(ABS(h.PAST_COUNT - m.BASELINE_MEDIAN)) as BASELINE_MAD
+    FROM history h
+    JOIN medians m ON m.BUCKET_HOUR = h.BUCKET_HOUR AND m.CHANNEL = h.CHANNEL AND m.CATEGORY = h.CATEGORY
+    GROUP BY h.BUCKET_HOUR, h.CHANNEL, h.CATEGORY
+  )
+  SELECT
+    n.BUCKET_HOUR,
+    n.CHANNEL,
+    n.CATEGORY,
+    n.COMPLAINT_COUNT,
+    m.BASELINE_MEDIAN,
+    d.BASELINE_MAD,
+    COALESCE(m.HISTORY_WEEKS, 0)
+  FROM new_buckets n
+  LEFT JOIN medians m ON m.BUCKET_HOUR = n.BUCKET_HOUR AND m.CHANNEL = n.CHANNEL AND m.CATEGORY = n.CATEGORY
+  LEFT JOIN mads d ON d.BUCKET_HOUR = n.BUCKET_HOUR AND d.CHANNEL = n.CHANNEL AND d.CATEGORY = n.CATEGORY;
+
+  -- MAD is floored so sparse, mostly-zero series do not flag every single complaint
+  MERGE INTO ANALYTICS.COMPLAINT_ANOMALY_SCORE t
+  USING (
+    SELECT
+      BUCKET_HOUR,
+      CHANNEL,
+      CATEGORY,
+      OBSERVED_COUNT,
+      BASELINE_MEDIAN,
+      BASELINE_MAD,
+      ROUND((OBSERVED_COUNT - BASELINE_MEDIAN) / GREATEST(1.4826 * BASELINE_MAD, 1.0), 3) as ROBUST_Z,
+      HISTORY_WEEKS >= 2
+        AND ABS((OBSERVED_COUNT - BASELINE_MEDIAN) / GREATEST(1.4826 * BASELINE_MAD, 1.0)) >= :Z_THRESHOLD as IS_ANOMALY,
+      HISTORY_WEEKS
+    FROM ANOMALY_SCORE_BATCH
+  ) s
+  ON t.BUCKET_HOUR = s.BUCKET_HOUR AND t.CHANNEL = s.CHANNEL AND t.CATEGORY = s.CATEGORY
+  WHEN MATCHED THEN UPDATE SET
+    OBSERVED_COUNT = s.OBSERVED_COUNT,
+    BASELINE_MEDIAN = s.BASELINE_MEDIAN,
+    BASELINE_MAD = s.BASELINE_MAD,
+    ROBUST_Z = s.ROBUST_Z,
+    IS_ANOMALY = s.IS_ANOMALY,
+    HISTORY_WEEKS = s.HISTORY_WEEKS,
+    SCORED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (
+    BUCKET_HOUR, CHANNEL, CATEGORY, OBSERVED_COUNT, BASELINE_MEDIAN, BASELINE_MAD,
+    ROBUST_Z, IS_ANOMALY, HISTORY_WEEKS, SCORED_AT
+  ) VALUES (
+    s.BUCKET_HOUR, s.CHANNEL, s.CATEGORY, s.OBSERVED_COUNT, s.BASELINE_MEDIAN, s.BASELINE_MAD,
+    s.ROBUST_Z, s.IS_ANOMALY, s.HISTORY_WEEKS, CURRENT_TIMESTAMP()
+  );
+
+  buckets_scored := (SELECT COUNT(*) FROM ANOMALY_SCORE_BATCH);
+
+  -- Keep the latest baseline per seasonal slot for inspection
+  MERGE INTO ANALYTICS.ANOMALY_BASELINE t
+  USING (
+    SELECT
+      DAYOFWEEKISO(BUCKET_HOUR) as WEEKDAY,
+      HOUR(BUCKET_HOUR) as HOUR_OF_DAY,
+      CHANNEL,
+      CATEGORY,
+      MAX_BY(BASELINE_MEDIAN, BUCKET_HOUR) as BASELINE_MEDIAN,
+      MAX_BY(BASELINE_MAD, BUCKET_HOUR) as BASELINE_MAD,
+      MAX_BY(HISTORY_WEEKS, BUCKET_HOUR) as HISTORY_WEEKS,
+      MAX(BUCKET_HOUR) as LAST_BUCKET_HOUR
+    FROM ANOMALY_SCORE_BATCH
+    WHERE HISTORY_WEEKS > 0
+    GROUP BY 1, 2, 3, 4
+  ) s
+  ON t.WEEKDAY = s.WEEKDAY AND t.HOUR_OF_DAY = s.HOUR_OF_DAY AND t.CHANNEL = s.CHANNEL AND t.CATEGORY = s.CATEGORY
+  WHEN MATCHED AND s.LAST_BUCKET_HOUR >= t.LAST_BUCKET_HOUR THEN UPDATE SET
+    BASELINE_MEDIAN = s.BASELINE_MEDIAN,
+    BASELINE_MAD = s.BASELINE_MAD,
+    HISTORY_WEEKS = s.HISTORY_WEEKS,
+    LAST_BUCKET_HOUR = s.LAST_BUCKET_HOUR,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (
+    WEEKDAY, HOUR_OF_DAY, CHANNEL, CATEGORY, BASELINE_MEDIAN, BASELINE_MAD, HISTORY_WEEKS, LAST_BUCKET_HOUR, UPDATED_AT
+  ) VALUES (
+    s.WEEKDAY, s.HOUR_OF_DAY, s.CHANNEL, s.CATEGORY, s.BASELINE_MEDIAN, s.BASELINE_MAD, s.HISTORY_WEEKS, s.LAST_BUCKET_HOUR, CURRENT_TIMESTAMP()
+  );
+
+  anomalies_found := (
+    SELECT COUNT(*)
+    FROM ANALYTICS.COMPLAINT_ANOMALY_SCORE sc
+    JOIN ANOMALY_SCORE_BATCH b
+      ON b.BUCKET_HOUR = sc.BUCKET_HOUR AND b.CHANNEL = sc.CHANNEL AND b.CATEGORY = sc.CATEGORY
+    WHERE sc.IS_ANOMALY
+  );
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+    RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
+  )
+  SELECT
+    UUID_STRING(),
+    'UPDATE_COMPLAINT_ANOMALIES',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :new_complaints,
+    OBJECT_CONSTRUCT(
+      'buckets_scored', :buckets_scored,
+      'anomalies_found', :anomalies_found,
+      'z_threshold', :Z_THRESHOLD
+    );
+
+  RETURN 'Anomaly detection: ' || new_complaints || ' complaints rolled up, ' || buckets_scored ||
+         ' buckets scored, ' || anomalies_found || ' anomalies';
+END;
+$$;
+
+-- =====================================================================
+-- SECTION 3: INCREMENTAL PIPELINE (STREAM & TASK)
+-- =====================================================================
+
+SELECT 'Creating rollup stream and task...' as STATUS;
+
+-- SHOW_INITIAL_ROWS makes the first run backfill the rollup from history
+CREATE STREAM IF NOT EXISTS COMPLAINTS.UNIFIED_COMPLAINT_ROLLUP_STREAM
+    ON TABLE COMPLAINTS.UNIFIED_COMPLAINT
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'New complaints pending hourly rollup and anomaly scoring';
+
+-- Initial backfill
+CALL ANALYTICS.UPDATE_COMPLAINT_ANOMALIES();
+
+-- Runs every 15 minutes; new hours are scored once they complete
+CREATE OR REPLACE TASK ANALYTICS.COMPLAINT_ANOMALY_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '15 MINUTE'
+    COMMENT = 'Hourly rollup maintenance and seasonal anomaly scoring'
+AS
+    CALL ANALYTICS.UPDATE_COMPLAINT_ANOMALIES();
+
+ALTER TASK ANALYTICS.COMPLAINT_ANOMALY_TASK RESUME;
+
+-- =====================================================================
+-- SECTION 4: COMPLAINT VOLUME FORECASTING
+-- =====================================================================
+
+SELECT 'Creating volume forecasting tables and procedure...' as STATUS;
+
+-- Holt-Winters state per channel (additive, weekly seasonality)
+CREATE TABLE IF NOT EXISTS FORECAST_MODEL_STATE (
+    CHANNEL VARCHAR(20) PRIMARY KEY,
+    LEVEL FLOAT,
+    TREND FLOAT,
+    SEASONAL VARIANT, -- 7 weekday offsets, index 0 = Monday
+    LAST_DATE DATE, -- Last complete day folded into the state
+    RECENT_APE VARIANT, -- One-step-ahead absolute % errors, last 28 days
+    MAPE FLOAT,
+    RESIDUAL_STD FLOAT,
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Per-channel Holt-Winters model state for volume forecasting';
+
+-- Cached daily forecasts, one row per channel and day ahead
+CREATE TABLE IF NOT EXISTS VOLUME_FORECAST (
+    FORECAST_DATE DATE NOT NULL,
+    CHANNEL VARCHAR(20) NOT NULL,
+    HORIZON_DAYS INT NOT NULL, -- Days ahead of LAST_DATE
+    FORECAST_COUNT FLOAT,
+    LOWER_BOUND FLOAT, -- ~95% interval
+    UPPER_BOUND FLOAT,
+    GENERATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (FORECAST_DATE, CHANNEL)
+) COMMENT = 'Daily complaint volume forecasts per channel';
+
+-- Share of a weekday's volume falling in each hour (trailing 8 weeks)
+CREATE TABLE IF NOT EXISTS VOLUME_HOURLY_PROFILE (
+    CHANNEL VARCHAR(20) NOT NULL,
+    WEEKDAY INT NOT NULL, -- 1 = Monday ... 7 = Sunday
+    HOUR_OF_DAY INT NOT NULL,
+    HOURLY_SHARE FLOAT,
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (CHANNEL, WEEKDAY, HOUR_OF_DAY)
+) COMMENT = 'Intraday volume profile used to spread daily forecasts over hours';
+
+-- Procedure to update the forecasting models and refresh cached forecasts
+-- Channels are updated together as numpy vectors; existing models only fold in
+-- days completed since their LAST_DATE, so history is not refit on each run
+CREATE OR REPLACE PROCEDURE UPDATE_VOLUME_FORECAST(HORIZON_DAYS INT DEFAULT 14)
+RETURNS STRING
+LANGUAGE PYTHON
+RUNTIME_VERSION = '3.11'
+PACKAGES = ('snowflake-snowpark-python', 'pandas', 'numpy')
+HANDLER = 'update_forecast'
+AS
+$$
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ALPHA, BETA, GAMMA = 0.3, 0.05, 0.2  # level, trend, seasonal smoothing
+SEASON = 7
+INIT_DAYS = 14  # Two weeks of history to initialise a new channel
+APE_WINDOW = 28
+
+
+def replace_rows(session, delete_sql, insert_sql):
+    """Run a DELETE + INSERT refresh as one transaction so readers never see an empty table"""
+    session.sql("BEGIN TRANSACTION").collect()
+    try:
+        session.sql(delete_sql).collect()
+        session.sql(insert_sql).collect()
+    except Exception:
+        session.sql("ROLLBACK").collect()
+        raise
+    session.sql("COMMIT").collect()
+
+
+def update_forecast(session, horizon_days):
+    started = datetime.utcnow()
+
+    daily = session.sql("""
+        SELECT COMPLAINT_DATE, CHANNEL, SUM(COMPLAINT_COUNT) as COMPLAINT_COUNT
+        FROM ANALYTICS.DAILY_SENTIMENT_ROLLUP
+        WHERE COMPLAINT_DATE < CURRENT_DATE()
+        GROUP BY COMPLAINT_DATE, CHANNEL
+    """).to_pandas()
+    if daily.empty:
+        return 'No complaint history to forecast'
+
+    # Channels x days matrix through yesterday, zero-filled for days without complaints
+    # (an ingestion gap still advances the model, so forecasts start tomorrow)
+    yesterday = session.sql("SELECT CURRENT_DATE() - 1").collect()[0][0]
+    daily['COMPLAINT_DATE'] = pd.to_datetime(daily['COMPLAINT_DATE']).dt.date
+    matrix = daily.pivot_table(index='CHANNEL', columns='COMPLAINT_DATE',
+                               values='COMPLAINT_COUNT', aggfunc='sum', fill_value=0)
+    days = list(pd.date_range(min(matrix.columns), max(max(matrix.columns), yesterday), freq='D').date)
+    matrix = matrix.reindex(columns=days, fill_value=0)
+    channels = list(matrix.index)
+    y = matrix.to_numpy(dtype=float)
+    n = len(channels)
+
+    level = np.zeros(n)
+    trend = np.zeros(n)
+    seasonal = np.zeros((n, SEASON))
+    variance = np.zeros(n)
+    start_idx = np.full(n, len(days))
+    apes = [[] for _ in range(n)]
+
+    state = {r['CHANNEL']: r for r in session.sql(
+        "SELECT CHANNEL, LEVEL, TREND, SEASONAL, LAST_DATE, RECENT_APE, RESIDUAL_STD "
+        "FROM ANALYTICS.FORECAST_MODEL_STATE").collect()}
+
+    for i, channel in enumerate(channels):
+        row = state.get(channel)
+        if row is not None:
+            level[i], trend[i] = row['LEVEL'], row['TREND']
+            seasonal[i] = json.loads(row['SEASONAL'])
+            apes[i] = json.loads(row['RECENT_APE'] or '[]')
+            variance[i] = (row['RESIDUAL_STD'] or 0) ** 2
+            start_idx[i] = sum(1 for d in days if d <= row['LAST_DATE'])
+        elif len(days) >= INIT_DAYS:
+            first, second = y[i, :SEASON], y[i, SEASON:INIT_DAYS]
+            level[i] = first.mean()
+            trend[i] = (second.mean() - first.mean()) / SEASON
+            for t in range(SEASON):
+                seasonal[i, days[t].weekday()] = first[t] - level[i]
+            start_idx[i] = SEASON
+
+    # Vectorised Holt-Winters recursion: loop over days, update all channels at once
+    rows_folded = 0
+    for t in range(int(start_idx.min()), len(days)):
+        active = start_idx <= t
+        if not active.any():
+            continue
+        wd = days[t].weekday()
+        s = seasonal[:, wd]
+        predicted = level + trend + s
+        error = y[:, t] - predicted
+        new_level = ALPHA * (y[:, t] - s) + (1 - ALPHA) * (level + trend)
+        new_trend = BETA * (new_level - level) + (1 - BETA) * trend
+        new_season = GAMMA * (y[:, t] - new_level) + (1 - GAMMA) * s
+        level = np.where(active, new_level, level)
+        trend = np.where(active, new_trend, trend)
+        seasonal[:, wd] = np.where(active, new_season, s)
+        variance = np.where(active, 0.9 * variance + 0.1 * error ** 2, variance)
+        for i in np.flatnonzero(active & (y[:, t] > 0)):
+            apes[i] = (apes[i] + [abs(error[i]) / y[i, t]])[-APE_WINDOW:]
+        rows_folded += int(active.sum())
+
+    modelled = [i for i in range(n) if start_idx[i] < len(days) or channels[i] in state]
+    if not modelled:
+        return 'Not enough history to initialise forecasting models'
+
+    last_day = days[-1]
+    residual_std = np.sqrt(variance)
+    state_rows, forecast_rows = [], []
+    for i in modelled:
+        mape = float(np.mean(apes[i]) * 100) if apes[i] else None
+        state_rows.append({
+            'CHANNEL': channels[i],
+            'LEVEL': float(level[i]),
+            'TREND': float(trend[i]),
+            'SEASONAL': json.dumps([round(float(v), 4) for v in seasonal[i]]),
+            'LAST_DATE': last_day,
+            'RECENT_APE': json.dumps([round(float(v), 4) for v in apes[i]]),
+            'MAPE': mape,
+            'RESIDUAL_STD': float(residual_std[i]),
+        })
+        for h in range(1, horizon_days + 1):
+            forecast_date = last_day + timedelta(days=h)
+            point = max(0.0, level[i] + h * trend[i] + seasonal[i, forecast_date.weekday()])
+            spread = 1.96 * residual_std[i] * np.sqrt(h)
+            forecast_rows.append({
+                'FORECAST_DATE': forecast_date,
+                'CHANNEL': channels[i],
+                'HORIZON_DAYS': h,
+                'FORECAST_COUNT': round(float(point), 2),
+                'LOWER_BOUND': round(float(max(0.0, point - spread)), 2),
+                'UPPER_BOUND': round(float(point + spread), 2),
+            })
+
+    session.write_pandas(pd.DataFrame(state_rows), 'FORECAST_STATE_STAGE',
+                         auto_create_table=True, table_type='temporary', overwrite=True)
+    session.write_pandas(pd.DataFrame(forecast_rows), 'VOLUME_FORECAST_STAGE',
+                         auto_create_table=True, table_type='temporary', overwrite=True)
+
+    session.sql("""
+        MERGE INTO ANALYTICS.FORECAST_MODEL_STATE t
+        USING FORECAST_STATE_STAGE s ON t.CHANNEL = s.CHANNEL
+        WHEN MATCHED THEN UPDATE SET
+            LEVEL = s.LEVEL, TREND = s.TREND, SEASONAL = PARSE_JSON(s.SEASONAL),
+            LAST_DATE = s.LAST_DATE, RECENT_APE = PARSE_JSON(s.RECENT_APE),
+            MAPE = s.MAPE, RESIDUAL_STD = s.RESIDUAL_STD, UPDATED_AT = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN INSERT (
+            CHANNEL, LEVEL, TREND, SEASONAL, LAST_DATE, RECENT_APE, MAPE, RESIDUAL_STD, UPDATED_AT
+        ) VALUES (
+            s.CHANNEL, s.LEVEL, s.TREND, PARSE_JSON(s.SEASONAL), s.LAST_DATE,
+            PARSE_JSON(s.RECENT_APE), s.MAPE, s.RESIDUAL_STD, CURRENT_TIMESTAMP()
+        )
+    """).collect()
+
+    replace_rows(session, "DELETE FROM ANALYTICS.VOLUME_FORECAST", """
+        INSERT INTO ANALYTICS.VOLUME_FORECAST (
+            FORECAST_DATE, CHANNEL, HORIZON_DAYS, FORECAST_COUNT, LOWER_BOUND, UPPER_BOUND, GENERATED_AT
+        )
+        SELECT FORECAST_DATE, CHANNEL, HORIZON_DAYS, FORECAST_COUNT, LOWER_BOUND, UPPER_BOUND, CURRENT_TIMESTAMP()
+        FROM VOLUME_FORECAST_STAGE
+    """)
+
+    # Intraday profile from the hourly rollup
+    replace_rows(session, "DELETE FROM ANALYTICS.VOLUME_HOURLY_PROFILE", """
+        INSERT INTO ANALYTICS.VOLUME_HOURLY_PROFILE (CHANNEL, WEEKDAY, HOUR_OF_DAY, HOURLY_SHARE, UPDATED_AT)
+        SELECT
+            CHANNEL,
+            DAYOFWEEKISO(BUCKET_HOUR) as WEEKDAY,
+            HOUR(BUCKET_HOUR) as HOUR_OF_DAY,
+            SUM(COMPLAINT_COUNT) / SUM(SUM(COMPLAINT_COUNT)) OVER (PARTITION BY CHANNEL, DAYOFWEEKISO(BUCKET_HOUR)),
+            CURRENT_TIMESTAMP()
+        FROM ANALYTICS.HOURLY_COMPLAINT_ROLLUP
+        WHERE BUCKET_HOUR >= DATEADD(week, -8, CURRENT_DATE())
+        GROUP BY CHANNEL, DAYOFWEEKISO(BUCKET_HOUR), HOUR(BUCKET_HOUR)
+    """)
+
+    duration_ms = int((datetime.utcnow() - started).total_seconds() * 1000)
+    session.sql("""
+        INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+            RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
+        )
+        SELECT UUID_STRING(), 'UPDATE_VOLUME_FORECAST', ?, CURRENT_TIMESTAMP(), ?, ?,
+               OBJECT_CONSTRUCT('channels', ?, 'horizon_days', ?, 'last_date', ?)
+    """, params=[started, duration_ms, rows_folded, len(modelled), horizon_days, str(last_day)]).collect()
+
+    return (f'Volume forecast updated: {len(modelled)} channels, {rows_folded} channel-days folded in, '
+            f'{len(forecast_rows)} forecasts through {last_day + timedelta(days=horizon_days)}')
+$$;
+
+-- Initial fit
+CALL ANALYTICS.UPDATE_VOLUME_FORECAST();
+
+-- Fold in each completed day shortly after midnight
+CREATE OR REPLACE TASK ANALYTICS.VOLUME_FORECAST_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = 'USING CRON 30 0 * * * UTC'
+    COMMENT = 'Daily incremental update of complaint volume forecasts'
+AS
+    CALL ANALYTICS.UPDATE_VOLUME_FORECAST();
+
+ALTER TASK ANALYTICS.VOLUME_FORECAST_TASK RESUME;
+
+-- =====================================================================
+-- SECTION 5: RECOMMENDATION TEXT CACHE
+-- =====================================================================
+
+SELECT 'Creating recommendation text cache...' as STATUS;
+
+-- Generated recommendation sentences keyed by a hash of the page's findings,
+-- prompt version and model (written by the Streamlit app, one row per data change)
+CREATE TABLE IF NOT EXISTS AI_RECOMMENDATION_TEXT (
+    FINDINGS_HASH VARCHAR(64) PRIMARY KEY, -- SHA-256 hex
+    PAGE VARCHAR(20) NOT NULL,
+    PROMPT_VERSION VARCHAR(20) NOT NULL,
+    MODEL VARCHAR(50) NOT NULL,
+    GENERATED_TEXT VARIANT, -- JSON array, one sentence per finding
+    CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Cached CORTEX.COMPLETE output for dashboard recommendations';
+
+-- =====================================================================
+-- SECTION 6: CUSTOMER SEGMENTATION
+-- =====================================================================
+
+SELECT 'Creating customer segmentation tables and procedure...' as STATUS;
+
+-- Latest segment assignment per customer
+CREATE TABLE IF NOT EXISTS CUSTOMER_SEGMENT (
+    CUSTOMER_ID VARCHAR(50) PRIMARY KEY,
+    SEGMENT_ID INT NOT NULL,
+    SEGMENT_NAME VARCHAR(100),
+    CENTROID_DISTANCE FLOAT, -- Distance to segment centroid in standardized units
+    RUN_ID VARCHAR(50),
+    ASSIGNED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Customer segment assignments from mini-batch k-means';
+
+-- Quality metrics and segment profiles per clustering run
+CREATE TABLE IF NOT EXISTS CUSTOMER_SEGMENT_RUN (
+    RUN_ID VARCHAR(50) PRIMARY KEY,
+    K INT,
+    CUSTOMERS INT,
+    SILHOUETTE_SCORE FLOAT, -- On a random sample of customers
+    SILHOUETTE_SAMPLE INT,
+    DAVIES_BOULDIN FLOAT, -- Over all customers
+    INERTIA FLOAT,
+    SEGMENT_PROFILES VARIANT, -- Per segment: name, size, centroid in original units
+    CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Customer segmentation runs and cluster quality metrics';
+
+-- Per-customer features over the trailing 12 months
+CREATE OR REPLACE VIEW V_CUSTOMER_SEGMENT_FEATURES AS
+WITH complaints AS (
+    SELECT 
+        c.CUSTOMER_ID,
+        COUNT(*) as COMPLAINT_COUNT,
+        AVG(IFF(c.CHANNEL = 'Voice', 1, 0)) as VOICE_SHARE,
+        AVG(IFF(c.CHANNEL = 'Email', 1, 0)) as EMAIL_SHARE,
+        AVG(IFF(c.CHANNEL = 'Chat', 1, 0)) as CHAT_SHARE,
+        AVG(IFF(c.CHANNEL = 'Social', 1, 0)) as SOCIAL_SHARE,
+        AVG(s.SENTIMENT_SCORE) as AVG_SENTIMENT
+    FROM COMPLAINTS.UNIFIED_COMPLAINT c
+    LEFT JOIN SENTIMENT.SENTIMENT_SCORE s ON s.COMPLAINT_ID = c.COMPLAINT_ID
+    WHERE c.COMPLAINT_TIMESTAMP >= DATEADD(month, -12, CURRENT_DATE())
+    GROUP BY c.CUSTOMER_ID
+),
+disputes AS (
+    SELECT cm.ACCOUNT_ID as CUSTOMER_ID, COUNT(*) as DISPUTE_COUNT
+    FROM BILLING_DATA.DISPUTE d
+    JOIN BILLING_DATA.BILLING_ACCOUNT ba ON ba.BILLING_ACCOUNT_ID = d.BILLING_ACCOUNT_ID
+    JOIN BILLING_DATA.CUSTOMER_MASTER cm ON cm.CUSTOMER_ID = ba.CUSTOMER_ID
+    WHERE d.OPENED_DATE >= DATEADD(month, -12, CURRENT_DATE())
+    GROUP BY cm.ACCOUNT_ID
+)
+SELECT 
+    a.ACCOUNT_ID as CUSTOMER_ID,
+    COALESCE(c.COMPLAINT_COUNT, 0) / 12.0 as COMPLAINTS_PER_MONTH,
+    COALESCE(c.VOICE_SHARE, 0) as VOICE_SHARE,
+    COALESCE(c.EMAIL_SHARE, 0) as EMAIL_SHARE,
+    COALESCE(c.CHAT_SHARE, 0) as CHAT_SHARE,
+    COALESCE(c.SOCIAL_SHARE, 0) as SOCIAL_SHARE,
+    COALESCE(d.DISPUTE_COUNT, 0) as DISPUTE_COUNT,
+    CASE UPPER(a.TIER) WHEN 'GOLD' THEN 3 WHEN 'SILVER' THEN 2 WHEN 'BRONZE' THEN 1 ELSE 0 END as TIER_LEVEL,
+    COALESCE(c.AVG_SENTIMENT, 0) as AVG_SENTIMENT
+FROM CUSTOMER_DATA.ACCOUNT a
+LEFT JOIN complaints c ON c.CUSTOMER_ID = a.ACCOUNT_ID
+LEFT JOIN disputes d ON d.CUSTOMER_ID = a.ACCOUNT_ID
+WHERE a.STATUS = 'active';
+
+-- Procedure to segment customers with mini-batch k-means
+-- Features are standardized with statistics computed in SQL, the model is
+-- trained with partial_fit over Snowpark result batches and a second pass
+-- assigns segments, so memory stays bounded by the batch size.
+CREATE OR REPLACE PROCEDURE UPDATE_CUSTOMER_SEGMENTS(K INT DEFAULT 4, SILHOUETTE_SAMPLE INT DEFAULT 10000)
+RETURNS STRING
+LANGUAGE PYTHON
+RUNTIME_VERSION = '3.11'
+PACKAGES = ('snowflake-snowpark-python', 'pandas', 'numpy', 'scikit-learn')
+HANDLER = 'update_segments'
+AS
+$$
+import json
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+FEATURES = ['COMPLAINTS_PER_MONTH', 'VOICE_SHARE', 'EMAIL_SHARE', 'CHAT_SHARE',
+            'SOCIAL_SHARE', 'DISPUTE_COUNT', 'TIER_LEVEL', 'AVG_SENTIMENT']
+FEATURE_LABELS = {
+    'COMPLAINTS_PER_MONTH': 'Frequent Complainers', 'VOICE_SHARE': 'Voice-First',
+    'EMAIL_SHARE': 'Email-First', 'CHAT_SHARE': 'Chat-First', 'SOCIAL_SHARE': 'Social-Vocal',
+    'DISPUTE_COUNT': 'Billing Disputers', 'TIER_LEVEL': 'Premium Tier', 'AVG_SENTIMENT': 'Satisfied'
+}
+SOURCE = 'ANALYTICS.V_CUSTOMER_SEGMENT_FEATURES'
+BATCH_SIZE = 4096
+
+
+def _batches(session):
+    for batch in session.sql(f"SELECT CUSTOMER_ID, {', '.join(FEATURES)} FROM {SOURCE}").to_pandas_batches():
+        if not batch.empty:
+            yield batch
+
+
+def update_segments(session, k, silhouette_sample):
+    started = datetime.utcnow()
+    run_id = str(uuid.uuid4())
+
+    stats = session.sql(
+        "SELECT COUNT(*) as N, "
+        + ", ".join(f"AVG({f}) as MEAN_{f}, STDDEV({f}) as STD_{f}" for f in FEATURES)
+        + f" FROM {SOURCE}"
+    ).collect()[0]
+    customers = stats['N']
+    if customers < k:
+        return f'Not enough customers to build {k} segments'
+    mean = np.array([stats[f'MEAN_{f}'] or 0.0 for f in FEATURES], dtype=float)
+    std = np.array([stats[f'STD_{f}'] or 0.0 for f in FEATURES], dtype=float)
+    std[std == 0] = 1.0
+
+    def scale(batch):
+        return (batch[FEATURES].to_numpy(dtype=float) - mean) / std
+
+    # Pass 1: train on streamed batches
+    model = MiniBatchKMeans(n_clusters=k, batch_size=BATCH_SIZE, random_state=42, n_init=3)
+    pending = None
+    for batch in _batches(session):
+        x = scale(batch)
+        pending = x if pending is None else np.vstack([pending, x])
+        if len(pending) >= max(k, BATCH_SIZE):
+            model.partial_fit(pending)
+            pending = None
+    if pending is not None and (hasattr(model, 'cluster_centers_') or len(pending) >= k):
+        model.partial_fit(pending)
+    centers = model.cluster_centers_
+
+    # Pass 2: assign segments and accumulate Davies-Bouldin / inertia terms
+    sizes = np.zeros(k)
+    distance_sums = np.zeros(k)
+    inertia = 0.0
+    first = True
+    for batch in _batches(session):
+        x = scale(batch)
+        labels = model.predict(x)
+        distances = np.linalg.norm(x - centers[labels], axis=1)
+        np.add.at(sizes, labels, 1)
+        np.add.at(distance_sums, labels, distances)
+        inertia += float(np.sum(distances ** 2))
+        session.write_pandas(
+            pd.DataFrame({
+                'CUSTOMER_ID': batch['CUSTOMER_ID'].to_numpy(),
+                'SEGMENT_ID': labels.astype(int),
+                'CENTROID_DISTANCE': distances.round(4),
+            }),
+            'CUSTOMER_SEGMENT_STAGE', auto_create_table=True, table_type='temporary', overwrite=first
+        )
+        first = False
+
+    # Davies-Bouldin: mean over clusters of the worst (s_i + s_j) / d(c_i, c_j)
+    spread = np.divide(distance_sums, sizes, out=np.zeros(k), where=sizes > 0)
+    center_dist = np.linalg.norm(centers[:, None, :] - centers[None, :, :], axis=2)
+    np.fill_diagonal(center_dist, np.inf)
+    davies_bouldin = float(np.mean(np.max((spread[:, None] + spread[None, :]) / center_dist, axis=1)))
+
+    # Silhouette on a random sample (quadratic in sample size)
+    sample = session.sql(
+        f"SELECT {', '.join(FEATURES)} FROM {SOURCE} SAMPLE ({int(silhouette_sample)} ROWS)"
+    ).to_pandas()
+    sample_x = scale(sample)
+    sample_labels = model.predict(sample_x)
+    silhouette = (float(silhouette_score(sample_x, sample_labels))
+                  if len(set(sample_labels)) > 1 else None)
+
+    # Name each segment after its most distinctive feature (largest standardized centroid)
+    profiles = []
+    for i in range(k):
+        top = int(np.argmax(centers[i]))
+        name = FEATURE_LABELS[FEATURES[top]] if centers[i, top] > 0.5 else 'Low-Touch'
+        taken = sum(1 for p in profiles if p['name'].split(' (')[0] == name)
+        name = f'{name} ({taken + 1})' if taken else name
+        profiles.append({
+            'segment_id': i,
+            'name': name,
+            'size': int(sizes[i]),
+            'centroid': {f: round(float(v), 3) for f, v in zip(FEATURES, centers[i] * std + mean)},
+        })
+    names = pd.DataFrame({'SEGMENT_ID': list(range(k)), 'SEGMENT_NAME': [p['name'] for p in profiles]})
+    session.write_pandas(names, 'CUSTOMER_SEGMENT_NAME_STAGE', auto_create_table=True,
+                         table_type='temporary', overwrite=True)
+
+    # One statement replaces the assignments, so readers never see an empty table
+    session.sql("""
+        INSERT OVERWRITE INTO ANALYTICS.CUSTOMER_SEGMENT (CUSTOMER_ID, SEGMENT_ID, SEGMENT_NAME, CENTROID_DISTANCE, RUN_ID, ASSIGNED_AT)
+        SELECT s."CUSTOMER_ID", s."SEGMENT_ID", n."SEGMENT_NAME", s."CENTROID_DISTANCE", ?, CURRENT_TIMESTAMP()
+        FROM CUSTOMER_SEGMENT_STAGE s
+        JOIN CUSTOMER_SEGMENT_NAME_STAGE n ON n."SEGMENT_ID" = s."SEGMENT_ID"
+    """, params=[run_id]).collect()
+
+    session.sql("""
+        INSERT INTO ANALYTICS.CUSTOMER_SEGMENT_RUN (
+            RUN_ID, K, CUSTOMERS, SILHOUETTE_SCORE, SILHOUETTE_SAMPLE, DAVIES_BOULDIN, INERTIA, SEGMENT_PROFILES, CREATED_AT
+        )
+        SELECT ?, ?, ?, ?, ?, ?, ?, PARSE_JSON(?), CURRENT_TIMESTAMP()
+    """, params=[run_id, k, int(sizes.sum()), silhouette, len(sample), davies_bouldin, inertia,
+                  json.dumps(profiles)]).collect()
+
+    duration_ms = int((datetime.utcnow() - started).total_seconds() * 1000)
+    session.sql("""
+        INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+            RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
+        )
+        SELECT ?, 'UPDATE_CUSTOMER_SEGMENTS', ?, CURRENT_TIMESTAMP(), ?, ?,
+               OBJECT_CONSTRUCT('k', ?, 'silhouette', ?, 'davies_bouldin', ?)
+    """, params=[run_id, started, duration_ms, int(sizes.sum()), k, silhouette, davies_bouldin]).collect()
+
+    return (f'Customer segments updated: {int(sizes.sum())} customers in {k} segments '
+            f'(silhouette {silhouette if silhouette is None else round(silhouette, 3)}, '
+            f'Davies-Bouldin {davies_bouldin:.3f})')
+$$;
+
+-- Initial segmentation
+CALL ANALYTICS.UPDATE_CUSTOMER_SEGMENTS();
+
+-- Re-segment weekly
+CREATE OR REPLACE TASK ANALYTICS.CUSTOMER_SEGMENT_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = 'USING CRON 0 3 * * 1 UTC'
+    COMMENT = 'Weekly customer segmentation with mini-batch k-means'
+AS
+    CALL ANALYTICS.UPDATE_CUSTOMER_SEGMENTS();
+
+ALTER TASK ANALYTICS.CUSTOMER_SEGMENT_TASK RESUME;
+
+-- =====================================================================
+-- SECTION 7: DAILY DISTINCT-COUNT SKETCHES
+-- =====================================================================
+
+SELECT 'Creating daily sketch rollups and procedure...' as STATUS;
+
+-- Distinct customers are stored as HyperLogLog sketches (HLL_EXPORT), which merge
+-- across rows with HLL_COMBINE(HLL_IMPORT(...)), so any date range re-aggregates
+-- from the daily rows. Snowflake's HLL has an average relative error of ~1.6%
+-- (4096 registers); estimates within about +/-3% hold for ~95% of ranges, and
+-- counts below a few hundred are near exact.
+
+-- Daily complaints by channel x region x city x tier
+CREATE TABLE IF NOT EXISTS DAILY_COMPLAINT_SKETCH (
+    COMPLAINT_DATE DATE NOT NULL,
+    CHANNEL VARCHAR(20) NOT NULL,
+    REGION VARCHAR(50) NOT NULL, -- 'Unknown' when the account has none
+    CITY VARCHAR(100) NOT NULL,
+    TIER VARCHAR(20) NOT NULL,
+    COMPLAINT_COUNT INT NOT NULL,
+    RESOLVED_COUNT INT NOT NULL,
+    HIGH_PRIORITY_OPEN INT NOT NULL,
+    NETWORK_COMPLAINTS INT NOT NULL,
+    CUSTOMER_SKETCH OBJECT, -- HLL of CUSTOMER_ID
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (COMPLAINT_DATE, CHANNEL, REGION, CITY, TIER)
+)
+CLUSTER BY (COMPLAINT_DATE)
+COMMENT = 'Daily complaint counts with mergeable HLL customer sketches';
+
+-- Daily rated usage by event type
+CREATE TABLE IF NOT EXISTS DAILY_USAGE_SKETCH (
+    EVENT_DATE DATE NOT NULL,
+    EVENT_TYPE VARCHAR(20) NOT NULL,
+    EVENT_COUNT INT NOT NULL,
+    TOTAL_CHARGES DECIMAL(18,4) NOT NULL,
+    SUBSCRIPTION_SKETCH OBJECT, -- HLL of SUBSCRIPTION_ID
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (EVENT_DATE, EVENT_TYPE)
+)
+CLUSTER BY (EVENT_DATE)
+COMMENT = 'Daily rated usage with mergeable HLL subscription sketches';
+
+-- Procedure to fold complaint and usage changes into the daily sketch rollups
+-- Complaint updates arrive as DELETE + INSERT and are applied with a -1/+1 sign so
+-- status-based counts stay exact; sketches only grow (re-adding an ID is a no-op).
+CREATE OR REPLACE PROCEDURE UPDATE_DAILY_SKETCHES()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  complaint_changes INT;
+  usage_events INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS COMPLAINT_SKETCH_DELTA (
+    COMPLAINT_DATE DATE,
+    CHANNEL VARCHAR(20),
+    REGION VARCHAR(50),
+    CITY VARCHAR(100),
+    TIER VARCHAR(20),
+    COMPLAINT_COUNT INT,
+    RESOLVED_COUNT INT,
+    HIGH_PRIORITY_OPEN INT,
+    NETWORK_COMPLAINTS INT,
+    CUSTOMER_SKETCH OBJECT,
+    CHANGED_ROWS INT
+  );
+  TRUNCATE TABLE COMPLAINT_SKETCH_DELTA;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS USAGE_SKETCH_DELTA (
+    EVENT_DATE DATE,
+    EVENT_TYPE VARCHAR(20),
+    EVENT_COUNT INT,
+    TOTAL_CHARGES DECIMAL(18,4),
+    SUBSCRIPTION_SKETCH OBJECT
+  );
+  TRUNCATE TABLE USAGE_SKETCH_DELTA;
+
+  -- Both drains and both MERGEs commit together so a failed MERGE leaves the stream offsets unmoved
+  BEGIN TRANSACTION;
+
+  INSERT INTO COMPLAINT_SKETCH_DELTA
+  WITH changes AS (
+    SELECT
+      c.*,
+      IFF(c.METADATA$ACTION = 'INSERT', 1, -1) as SIGN
+    FROM COMPLAINTS.UNIFIED_COMPLAINT_SKETCH_STREAM c
+  )
+  SELECT
+    TO_DATE(ch.COMPLAINT_TIMESTAMP),
+    ch.CHANNEL,
+    COALESCE(a.REGION, 'Unknown'),
+    COALESCE(a.CITY, 'Unknown'),
+    COALESCE(a.TIER, 'Unknown'),
+    SUM(ch.SIGN),
+    SUM(IFF(ch.STATUS IN ('Resolved', 'Closed'), ch.SIGN, 0)),
+    SUM(IFF(ch.PRIORITY = 'High' AND ch.STATUS NOT IN ('Resolved', 'Closed'), ch.SIGN, 0)),
+    SUM(IFF(ch.NETWORK_INCIDENT_ID IS NOT NULL, ch.SIGN, 0)),
+    HLL_EXPORT(HLL_ACCUMULATE(IFF(ch.SIGN = 1, ch.CUSTOMER_ID, NULL))),
+    COUNT(*)
+  FROM changes ch
+  LEFT JOIN CUSTOMER_DATA.ACCOUNT a ON a.ACCOUNT_ID = ch.ACCOUNT_ID
+  GROUP BY 1, 2, 3, 4, 5;
+
+  complaint_changes := (SELECT COALESCE(SUM(CHANGED_ROWS), 0) FROM COMPLAINT_SKETCH_DELTA);
+
+  MERGE INTO ANALYTICS.DAILY_COMPLAINT_SKETCH t
+  USING (
+    WITH sketches AS (
+      SELECT d.COMPLAINT_DATE, d.CHANNEL, d.REGION, d.CITY, d.TIER,
+             HLL_EXPORT(HLL_COMBINE(HLL_IMPORT(x.CUSTOMER_SKETCH))) as CUSTOMER_SKETCH
+      FROM COMPLAINT_SKETCH_DELTA d
+      JOIN (
+        SELECT COMPLAINT_DATE, CHANNEL, REGION, CITY, TIER, CUSTOMER_SKETCH FROM COMPLAINT_SKETCH_DELTA
+        UNION ALL
+        SELECT COMPLAINT_DATE, CHANNEL, REGION, CITY, TIER, CUSTOMER_SKETCH FROM ANALYTICS.DAILY_COMPLAINT_SKETCH
+      ) x
+        ON x.COMPLAINT_DATE = d.COMPLAINT_DATE AND x.CHANNEL = d.CHANNEL
+        AND x.REGION = d.REGION AND x.CITY = d.CITY AND x.TIER = d.TIER
+      WHERE x.CUSTOMER_SKETCH IS NOT NULL
+      GROUP BY d.COMPLAINT_DATE, d.CHANNEL, d.REGION, d.CITY, d.TIER
+    )
+    SELECT d.*, sk.CUSTOMER_SKETCH as MERGED_SKETCH
+    FROM COMPLAINT_SKETCH_DELTA d
+    LEFT JOIN sketches sk
+      ON sk.COMPLAINT_DATE = d.COMPLAINT_DATE AND sk.CHANNEL = d.CHANNEL
+      AND sk.REGION = d.REGION AND sk.CITY = d.CITY AND sk.TIER = d.TIER
+  ) s
+  ON t.COMPLAINT_DATE = s.COMPLAINT_DATE AND t.CHANNEL = s.CHANNEL AND t.REGION = s.REGION AND t.CITY = s.CITY
+    AND t.TIER = s.TIER
+  WHEN MATCHED THEN UPDATE SET
+    COMPLAINT_COUNT = t.COMPLAINT_COUNT + s.COMPLAINT_COUNT,
+    RESOLVED_COUNT = t.RESOLVED_COUNT + s.RESOLVED_COUNT,
+    HIGH_PRIORITY_OPEN = t.HIGH_PRIORITY_OPEN + s.HIGH_PRIORITY_OPEN,
+    NETWORK_COMPLAINTS = t.NETWORK_COMPLAINTS + s.NETWORK_COMPLAINTS,
+    CUSTOMER_SKETCH = s.MERGED_SKETCH,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (
+    COMPLAINT_DATE, CHANNEL, REGION, CITY, TIER, COMPLAINT_COUNT, RESOLVED_COUNT,
+    HIGH_PRIORITY_OPEN, NETWORK_COMPLAINTS, CUSTOMER_SKETCH, UPDATED_AT
+  ) VALUES (
+    s.COMPLAINT_DATE, s.CHANNEL, s.REGION, s.CITY, s.TIER, s.COMPLAINT_COUNT, s.RESOLVED_COUNT,
+    s.HIGH_PRIORITY_OPEN, s.NETWORK_COMPLAINTS, s.MERGED_SKETCH, CURRENT_TIMESTAMP()
+  );
+
+  INSERT INTO USAGE_SKETCH_DELTA
+  SELECT
+    TO_DATE(EVENT_TIMESTAMP),
+    COALESCE(EVENT_TYPE, 'unknown'),
+    COUNT(*),
+    COALESCE(SUM(RATED_AMOUNT), 0),
+    HLL_EXPORT(HLL_ACCUMULATE(SUBSCRIPTION_ID))
+  FROM BILLING_DATA.RATED_EVENTS_SKETCH_STREAM
+  WHERE METADATA$ACTION = 'INSERT'
+  GROUP BY 1, 2;
+
+  usage_events := (SELECT COALESCE(SUM(EVENT_COUNT), 0) FROM USAGE_SKETCH_DELTA);
+
+  MERGE INTO ANALYTICS.DAILY_USAGE_SKETCH t
+  USING (
+    WITH sketches AS (
+      SELECT d.EVENT_DATE, d.EVENT_TYPE,
+             HLL_EXPORT(HLL_COMBINE(HLL_IMPORT(x.SUBSCRIPTION_SKETCH))) as SUBSCRIPTION_SKETCH
+      FROM USAGE_SKETCH_DELTA d
+      JOIN (
+        SELECT EVENT_DATE, EVENT_TYPE, SUBSCRIPTION_SKETCH FROM USAGE_SKETCH_DELTA
+        UNION ALL
+        SELECT EVENT_DATE, EVENT_TYPE, SUBSCRIPTION_SKETCH FROM ANALYTICS.DAILY_USAGE_SKETCH
+      ) x
+        ON x.EVENT_DATE = d.EVENT_DATE AND x.EVENT_TYPE = d.EVENT_TYPE
+      WHERE x.SUBSCRIPTION_SKETCH IS NOT NULL
+      GROUP BY d.EVENT_DATE, d.EVENT_TYPE
+    )
+    SELECT d.*, sk.SUBSCRIPTION_SKETCH as MERGED_SKETCH
+    FROM USAGE_SKETCH_DELTA d
+    LEFT JOIN sketches sk ON sk.EVENT_DATE = d.EVENT_DATE AND sk.EVENT_TYPE = d.EVENT_TYPE
+  ) s
+  ON t.EVENT_DATE = s.EVENT_DATE AND t.EVENT_TYPE = s.EVENT_TYPE
+  WHEN MATCHED THEN UPDATE SET
+    EVENT_COUNT = t.EVENT_COUNT + s.EVENT_COUNT,
+    TOTAL_CHARGES = t.TOTAL_CHARGES + s.TOTAL_CHARGES,
+    SUBSCRIPTION_SKETCH = s.MERGED_SKETCH,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (EVENT_DATE, EVENT_TYPE, EVENT_COUNT, TOTAL_CHARGES, SUBSCRIPTION_SKETCH, UPDATED_AT)
+  VALUES (s.EVENT_DATE, s.EVENT_TYPE, s.EVENT_COUNT, s.TOTAL_CHARGES, s.MERGED_SKETCH, CURRENT_TIMESTAMP());
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS)
+  SELECT
+    UUID_STRING(),
+    'UPDATE_DAILY_SKETCHES',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :complaint_changes + :usage_events,
+    OBJECT_CONSTRUCT('complaint_changes', :complaint_changes, 'usage_events', :usage_events);
+
+  RETURN 'Daily sketches updated: ' || complaint_changes || ' complaint changes, ' || usage_events || ' usage events';
+END;
+$$;
+
+-- Streams are kept across re-runs so history is not folded in twice
+-- Not append-only: status updates must reach the signed counts
+CREATE STREAM IF NOT EXISTS COMPLAINTS.UNIFIED_COMPLAINT_SKETCH_STREAM
+    ON TABLE COMPLAINTS.UNIFIED_COMPLAINT
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'Complaint changes pending daily sketch rollup';
+
+CREATE STREAM IF NOT EXISTS BILLING_DATA.RATED_EVENTS_SKETCH_STREAM
+    ON TABLE BILLING_DATA.RATED_EVENTS
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'New rated events pending daily sketch rollup';
+
+-- Initial backfill
+CALL ANALYTICS.UPDATE_DAILY_SKETCHES();
+
+CREATE OR REPLACE TASK ANALYTICS.DAILY_SKETCH_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '15 MINUTE'
+    COMMENT = 'Daily complaint and usage sketch rollups'
+WHEN
+    SYSTEM$STREAM_HAS_DATA('COMPLAINTS.UNIFIED_COMPLAINT_SKETCH_STREAM')
+    OR SYSTEM$STREAM_HAS_DATA('BILLING_DATA.RATED_EVENTS_SKETCH_STREAM')
+AS
+    CALL ANALYTICS.UPDATE_DAILY_SKETCHES();
+
+ALTER TASK ANALYTICS.DAILY_SKETCH_TASK RESUME;
+
+-- =====================================================================
+-- SECTION 8: DAILY PERCENTILE DIGESTS
+-- =====================================================================
+
+SELECT 'Creating daily percentile digests and procedure...' as STATUS;
+
+-- Resolution, handle and wait times are kept as t-digest states
+-- (APPROX_PERCENTILE_ACCUMULATE), which merge with APPROX_PERCENTILE_COMBINE, so
+-- p50/p90/p99 for any date range come from the daily rows without sorting raw
+-- samples. Tail quantiles are the most accurate; mid-range quantiles are typically
+-- within ~1% of the exact value.
+--   resolution_hours - CUSTOMER_DATA.CASE.RESOLUTION_TIME_MINUTES / 60, by case created date
+--   handle_seconds   - VOICE_METADATA.HANDLE_TIME_SECONDS, CHAT_SESSION.DURATION_SECONDS
+--   wait_seconds     - VOICE_METADATA.WAIT_TIME_SECONDS, CHAT_SESSION.WAIT_TIME_SECONDS
+CREATE TABLE IF NOT EXISTS DAILY_TIMING_DIGEST (
+    METRIC_DATE DATE NOT NULL,
+    CHANNEL VARCHAR(20) NOT NULL, -- Voice, Chat, Email, ... (case channel for resolution)
+    PRIORITY VARCHAR(20) NOT NULL, -- case priority, 'Unknown' when not linked to a case
+    METRIC VARCHAR(30) NOT NULL,
+    SAMPLE_COUNT INT NOT NULL,
+    VALUE_SUM FLOAT NOT NULL,
+    DIGEST OBJECT, -- APPROX_PERCENTILE state
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (METRIC_DATE, CHANNEL, PRIORITY, METRIC)
+)
+CLUSTER BY (METRIC_DATE)
+COMMENT = 'Daily resolution/handle/wait time digests for approximate percentiles';
+
+-- Procedure to fold new timing samples into the daily digests
+-- A case contributes its resolution time once, when RESOLUTION_TIME_MINUTES is first set.
+CREATE OR REPLACE PROCEDURE UPDATE_TIMING_DIGESTS()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  samples_added INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS TIMING_DIGEST_DELTA (
+    METRIC_DATE DATE,
+    CHANNEL VARCHAR(20),
+    PRIORITY VARCHAR(20),
+    METRIC VARCHAR(30),
+    SAMPLE_COUNT INT,
+    VALUE_SUM FLOAT,
+    DIGEST OBJECT
+  );
+  TRUNCATE TABLE TIMING_DIGEST_DELTA;
+
+  BEGIN TRANSACTION;
+
+  INSERT INTO TIMING_DIGEST_DELTA
+  WITH case_changes AS (
+    SELECT * FROM CUSTOMER_DATA.CASE_TIMING_STREAM
+  ),
+  calls AS (
+    SELECT
+      -- Metadata can land before its transcript; the stream row is consumed either way
+      TO_DATE(COALESCE(vt.CALL_TIMESTAMP, vm.CREATED_DATE)) as METRIC_DATE,
+      INITCAP(COALESCE(cs.PRIORITY, 'unknown')) as PRIORITY,
+      vm.HANDLE_TIME_SECONDS,
+      vm.WAIT_TIME_SECONDS
+    FROM COMPLAINTS.VOICE_METADATA_TIMING_STREAM vm
+    LEFT JOIN COMPLAINTS.VOICE_TRANSCRIPT vt ON vt.CALL_ID = vm.CALL_ID
+    LEFT JOIN CUSTOMER_DATA.CASE cs ON cs.CASE_ID = vt.CASE_ID
+    WHERE vm.METADATA$ACTION = 'INSERT'
+  ),
+  chats AS (
+    SELECT
+      TO_DATE(ch.START_TIMESTAMP) as METRIC_DATE,
+      INITCAP(COALESCE(cs.PRIORITY, 'unknown')) as PRIORITY,
+      ch.DURATION_SECONDS,
+      ch.WAIT_TIME_SECONDS
+    FROM COMPLAINTS.CHAT_SESSION_TIMING_STREAM ch
+    LEFT JOIN CUSTOMER_DATA.CASE cs ON cs.CASE_ID = ch.CASE_ID
+    WHERE ch.METADATA$ACTION = 'INSERT'
+  ),
+  samples AS (
+    SELECT
+      TO_DATE(c.CREATED_DATE) as METRIC_DATE,
+      INITCAP(COALESCE(c.CHANNEL, 'unknown')) as CHANNEL,
+      INITCAP(COALESCE(c.PRIORITY, 'unknown')) as PRIORITY,
+      'resolution_hours' as METRIC,
+      c.RESOLUTION_TIME_MINUTES / 60.0 as VALUE
+    FROM case_changes c
+    WHERE c.METADATA$ACTION = 'INSERT'
+      AND c.RESOLUTION_TIME_MINUTES IS NOT NULL
+      AND NOT EXISTS (
+        SELECT 1 FROM case_changes p
+        WHERE p.METADATA$ACTION = 'DELETE'
+          AND p.CASE_ID = c.CASE_ID
+          AND p.RESOLUTION_TIME_MINUTES IS NOT NULL
+      )
+    UNION ALL SELECT METRIC_DATE, 'Voice', PRIORITY, 'handle_seconds', HANDLE_TIME_SECONDS FROM calls
+    UNION ALL SELECT METRIC_DATE, 'Voice', PRIORITY, 'wait_seconds', WAIT_TIME_SECONDS FROM calls
+    UNION ALL SELECT METRIC_DATE, 'Chat', PRIORITY, 'handle_seconds', DURATION_SECONDS FROM chats
+    UNION ALL SELECT METRIC_DATE, 'Chat', PRIORITY, 'wait_seconds', WAIT_TIME_SECONDS FROM chats
+  )
+  SELECT
+    METRIC_DATE,
+    CHANNEL,
+    PRIORITY,
+    METRIC,
+    COUNT(*),
+    SUM(VALUE),
+    APPROX_PERCENTILE_ACCUMULATE(VALUE)
+  FROM samples
+  WHERE VALUE IS NOT NULL AND VALUE >= 0
+  GROUP BY 1, 2, 3, 4;
+
+  samples_added := (SELECT COALESCE(SUM(SAMPLE_COUNT), 0) FROM TIMING_DIGEST_DELTA);
+
+  MERGE INTO ANALYTICS.DAILY_TIMING_DIGEST t
+  USING (
+    WITH digests AS (
+      SELECT d.METRIC_DATE, d.CHANNEL, d.PRIORITY, d.METRIC,
+             APPROX_PERCENTILE_COMBINE(x.DIGEST) as DIGEST
+      FROM TIMING_DIGEST_DELTA d
+      JOIN (
+        SELECT METRIC_DATE, CHANNEL, PRIORITY, METRIC, DIGEST FROM TIMING_DIGEST_DELTA
+        UNION ALL
+        SELECT METRIC_DATE, CHANNEL, PRIORITY, METRIC, DIGEST FROM ANALYTICS.DAILY_TIMING_DIGEST
+      ) x
+        ON x.METRIC_DATE = d.METRIC_DATE AND x.CHANNEL = d.CHANNEL
+        AND x.PRIORITY = d.PRIORITY AND x.METRIC = d.METRIC
+      WHERE x.DIGEST IS NOT NULL
+      GROUP BY d.METRIC_DATE, d.CHANNEL, d.PRIORITY, d.METRIC
+    )
+    SELECT d.*, dg.DIGEST as MERGED_DIGEST
+    FROM TIMING_DIGEST_DELTA d
+    LEFT JOIN digests dg
+      ON dg.METRIC_DATE = d.METRIC_DATE AND dg.CHANNEL = d.CHANNEL
+      AND dg.PRIORITY = d.PRIORITY AND dg.METRIC = d.METRIC
+  ) s
+  ON t.METRIC_DATE = s.METRIC_DATE AND t.CHANNEL = s.CHANNEL
+    AND t.PRIORITY = s.PRIORITY AND t.METRIC = s.METRIC
+  WHEN MATCHED THEN UPDATE SET
+    SAMPLE_COUNT = t.SAMPLE_COUNT + s.SAMPLE_COUNT,
+    VALUE_SUM = t.VALUE_SUM + s.VALUE_SUM,
+    DIGEST = s.MERGED_DIGEST,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (METRIC_DATE, CHANNEL, PRIORITY, METRIC, SAMPLE_COUNT, VALUE_SUM, DIGEST, UPDATED_AT)
+  VALUES (s.METRIC_DATE, s.CHANNEL, s.PRIORITY, s.METRIC, s.SAMPLE_COUNT, s.VALUE_SUM, s.MERGED_DIGEST, CURRENT_TIMESTAMP());
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS)
+  SELECT
+    UUID_STRING(),
+    'UPDATE_TIMING_DIGESTS',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :samples_added,
+    OBJECT_CONSTRUCT('digest_rows', (SELECT COUNT(*) FROM TIMING_DIGEST_DELTA));
+
+  RETURN 'Timing digests updated: ' || samples_added || ' samples';
+END;
+$$;
+
+-- Not append-only: resolution times are set by updates to existing cases
+CREATE STREAM IF NOT EXISTS CUSTOMER_DATA.CASE_TIMING_STREAM
+    ON TABLE CUSTOMER_DATA.CASE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'Case changes pending resolution-time digests';
+
+CREATE STREAM IF NOT EXISTS COMPLAINTS.VOICE_METADATA_TIMING_STREAM
+    ON TABLE COMPLAINTS.VOICE_METADATA
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'New call metrics pending handle/wait time digests';
+
+CREATE STREAM IF NOT EXISTS COMPLAINTS.CHAT_SESSION_TIMING_STREAM
+    ON TABLE COMPLAINTS.CHAT_SESSION
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'New chat sessions pending handle/wait time digests';
+
+-- Initial backfill
+CALL ANALYTICS.UPDATE_TIMING_DIGESTS();
+
+CREATE OR REPLACE TASK ANALYTICS.TIMING_DIGEST_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '15 MINUTE'
+    COMMENT = 'Daily resolution, handle and wait time digests'
+WHEN
+    SYSTEM$STREAM_HAS_DATA('CUSTOMER_DATA.CASE_TIMING_STREAM')
+    OR SYSTEM$STREAM_HAS_DATA('COMPLAINTS.VOICE_METADATA_TIMING_STREAM')
+    OR SYSTEM$STREAM_HAS_DATA('COMPLAINTS.CHAT_SESSION_TIMING_STREAM')
+AS
+    CALL ANALYTICS.UPDATE_TIMING_DIGESTS();
+
+ALTER TASK ANALYTICS.TIMING_DIGEST_TASK RESUME;
+
+-- =====================================================================
+-- SECTION 9: SUMMARY
+-- =====================================================================
+
+SELECT '===========================================================' as SUMMARY
+UNION ALL SELECT 'ANALYTICS PIPELINES COMPLETE!'
+UNION ALL SELECT '==========================================================='
+UNION ALL SELECT ''
+UNION ALL SELECT 'Anomaly Detection:'
+UNION ALL SELECT '  - Hourly Rollup Buckets: ' || (SELECT COUNT(*) FROM ANALYTICS.HOURLY_COMPLAINT_ROLLUP)
+UNION ALL SELECT '  - Scored Buckets: ' || (SELECT COUNT(*) FROM ANALYTICS.COMPLAINT_ANOMALY_SCORE)
+UNION ALL SELECT '  - Anomalies: ' || (SELECT COUNT(*) FROM ANALYTICS.COMPLAINT_ANOMALY_SCORE WHERE IS_ANOMALY)
+UNION ALL SELECT '  - Anomaly Task: COMPLAINT_ANOMALY_TASK (every 15 minutes)'
+UNION ALL SELECT ''
+UNION ALL SELECT 'Volume Forecasting:'
+UNION ALL SELECT '  - Channels Modelled: ' || (SELECT COUNT(*) FROM ANALYTICS.FORECAST_MODEL_STATE)
+UNION ALL SELECT '  - Average MAPE: ' || COALESCE((SELECT ROUND(AVG(MAPE), 1)::VARCHAR FROM ANALYTICS.FORECAST_MODEL_STATE), 'n/a') || '%'
+UNION ALL SELECT '  - Forecast Task: VOLUME_FORECAST_TASK (daily 00:30 UTC)'
+UNION ALL SELECT ''
+UNION ALL SELECT 'Recommendation Text Cache:'
+UNION ALL SELECT '  - Cached Generations: ' || (SELECT COUNT(*) FROM ANALYTICS.AI_RECOMMENDATION_TEXT)
+UNION ALL SELECT ''
+UNION ALL SELECT 'Customer Segmentation:'
+UNION ALL SELECT '  - Segmented Customers: ' || (SELECT COUNT(*) FROM ANALYTICS.CUSTOMER_SEGMENT)
+UNION ALL SELECT '  - Silhouette: ' || COALESCE((SELECT ROUND(MAX_BY(SILHOUETTE_SCORE, CREATED_AT), 3)::VARCHAR FROM ANALYTICS.CUSTOMER_SEGMENT_RUN), 'n/a')
+UNION ALL SELECT '  - Segment Task: CUSTOMER_SEGMENT_TASK (weekly, Monday 03:00 UTC)'
+UNION ALL SELECT ''
+UNION ALL SELECT 'Distinct-Count Sketches:'
+UNION ALL SELECT '  - Daily Complaint Sketch Rows: ' || (SELECT COUNT(*) FROM ANALYTICS.DAILY_COMPLAINT_SKETCH)
+UNION ALL SELECT '  - Unique Customers (HLL): ' || COALESCE((SELECT HLL_ESTIMATE(HLL_COMBINE(HLL_IMPORT(CUSTOMER_SKETCH)))::VARCHAR FROM ANALYTICS.DAILY_COMPLAINT_SKETCH), 'n/a')
+UNION ALL SELECT '  - Daily Usage Sketch Rows: ' || (SELECT COUNT(*) FROM ANALYTICS.DAILY_USAGE_SKETCH)
+UNION ALL SELECT '  - Sketch Task: DAILY_SKETCH_TASK (every 15 minutes)'
+UNION ALL SELECT ''
+UNION ALL SELECT 'Percentile Digests:'
+UNION ALL SELECT '  - Daily Digest Rows: ' || (SELECT COUNT(*) FROM ANALYTICS.DAILY_TIMING_DIGEST)
+UNION ALL SELECT '  - p90 Resolution (hours): ' || COALESCE((SELECT ROUND(APPROX_PERCENTILE_ESTIMATE(APPROX_PERCENTILE_COMBINE(DIGEST), 0.9), 1)::VARCHAR FROM ANALYTICS.DAILY_TIMING_DIGEST WHERE METRIC = 'resolution_hours'), 'n/a')
+UNION ALL SELECT '  - Digest Task: TIMING_DIGEST_TASK (every 15 minutes)'
+UNION ALL SELECT ''
+UNION ALL SELECT '===========================================================';
@@ -0,0 +1,801 @@
+-- =====================================================================
+-- UC3 - Customer Complaints & Sentiment Analysis
+-- Network Correlation: Incident-Complaint Linking, Incident Summary & Geo Grid
+-- =====================================================================
+-- Purpose: Map customers to sites, link complaints to UC2 incidents, lag histograms,
+--          per-incident complaint summaries, hourly complaint counts per H3 hex cell
+-- Prerequisite: Run load_uc2_reference_data.sql and create_sentiment_models.sql first
+-- Execution: Run in Snowflake UI (Worksheets) with "Run All"
+-- Time: ~2-5 minutes
+-- =====================================================================
+
+USE ROLE SYSADMIN;
+USE WAREHOUSE COMPUTE_WH;
+USE DATABASE UC3_CUSTOMER_COMPLAINTS;
+
+-- =====================================================================
+-- SECTION 1: LINK TABLES
+-- =====================================================================
+
+USE SCHEMA INTEGRATION;
+
+SELECT 'Creating incident index and lag tables...' as STATUS;
+
+-- Temporal index: each incident is listed under its site for every hour of its
+-- linking window, so candidate lookup is an equi-join on (SITE_ID, BUCKET_HOUR)
+CREATE TABLE IF NOT EXISTS INCIDENT_SITE_HOUR_INDEX (
+    SITE_ID VARCHAR(50) NOT NULL,
+    BUCKET_HOUR TIMESTAMP_NTZ NOT NULL,
+    INCIDENT_ID VARCHAR(50) NOT NULL,
+    INCIDENT_TIMESTAMP TIMESTAMP_NTZ NOT NULL,
+    SEVERITY VARCHAR(20),
+    PRIMARY KEY (SITE_ID, BUCKET_HOUR, INCIDENT_ID)
+)
+CLUSTER BY (SITE_ID, BUCKET_HOUR)
+COMMENT = 'Incidents bucketed by site and hour for complaint linking';
+
+-- Complaints per hour after incident start, per incident (incremented as links are made)
+CREATE TABLE IF NOT EXISTS INCIDENT_LAG_HISTOGRAM (
+    INCIDENT_ID VARCHAR(50) NOT NULL,
+    INCIDENT_TIMESTAMP TIMESTAMP_NTZ NOT NULL,
+    LAG_HOUR INT NOT NULL, -- Whole hours between incident start and complaint
+    COMPLAINT_COUNT INT NOT NULL,
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (INCIDENT_ID, LAG_HOUR)
+)
+CLUSTER BY (INCIDENT_TIMESTAMP)
+COMMENT = 'Per-incident time-to-complaint histograms';
+
+-- Complaints per H3 hex cell per hour (cell of the customer's primary site)
+CREATE TABLE IF NOT EXISTS COMPLAINT_H3_HOURLY (
+    H3_CELL VARCHAR(20) NOT NULL, -- H3 index at resolution 7 (~5 km2 hexagons)
+    HOUR_START TIMESTAMP_NTZ NOT NULL,
+    REGION VARCHAR(50),
+    COMPLAINT_COUNT INT NOT NULL,
+    NETWORK_COMPLAINTS INT NOT NULL, -- Complaints stamped with a network incident
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (H3_CELL, HOUR_START)
+)
+CLUSTER BY (HOUR_START)
+COMMENT = 'Hourly complaint counts per H3 cell for network maps';
+
+-- Network complaints per incident, day and category (merged across days at query time)
+CREATE TABLE IF NOT EXISTS INCIDENT_COMPLAINT_SUMMARY (
+    INCIDENT_ID VARCHAR(50) NOT NULL,
+    COMPLAINT_DATE DATE NOT NULL,
+    CATEGORY VARCHAR(100) NOT NULL, -- 'Uncategorized' when the complaint has none
+    COMPLAINT_COUNT INT NOT NULL,
+    RESOLVED_COUNT INT NOT NULL,
+    CUSTOMER_SKETCH OBJECT, -- HLL_EXPORT of affected customers; combine with HLL_COMBINE(HLL_IMPORT(...))
+    FIRST_COMPLAINT TIMESTAMP_NTZ,
+    LAST_COMPLAINT TIMESTAMP_NTZ,
+    COMPLAINT_EPOCH_SUM NUMBER(38,0) NOT NULL, -- Sum of complaint epoch seconds, for average complaint age
+    REVENUE_AT_RISK DECIMAL(15,2) NOT NULL, -- Active monthly charges of customers on their first complaint for the incident
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (INCIDENT_ID, COMPLAINT_DATE, CATEGORY)
+)
+CLUSTER BY (COMPLAINT_DATE)
+COMMENT = 'Incremental per-incident complaint aggregates with HLL customer sketches';
+
+-- =====================================================================
+-- SECTION 2: CUSTOMER SITE MAPPING
+-- =====================================================================
+
+SELECT 'Creating customer site mapping procedure...' as STATUS;
+
+-- Procedure to map each active account to its primary site plus up to 3 nearby sites
+-- Spatial index: sites and accounts are bucketed on a 0.1 degree grid and each
+-- account only checks its own and the 8 neighbouring buckets (~8-11 km reach).
+CREATE OR REPLACE PROCEDURE REFRESH_CUSTOMER_SITE_MAPPING(MAX_DISTANCE_KM FLOAT DEFAULT 8)
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  mapped INT;
+  removed INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS SITE_MAPPING_CANDIDATE (
+    ACCOUNT_ID VARCHAR(50),
+    SITE_ID VARCHAR(50),
+    DISTANCE_KM FLOAT,
+    PRIMARY_SITE BOOLEAN
+  );
+  TRUNCATE TABLE SITE_MAPPING_CANDIDATE;
+
+  INSERT INTO SITE_MAPPING_CANDIDATE
+  WITH sites AS (
+    SELECT
+      SITE_ID,
+      LATITUDE,
+      LONGITUDE,
+      LEAST(COALESCE(COVERAGE_RADIUS_KM, :MAX_DISTANCE_KM), :MAX_DISTANCE_KM) as REACH_KM,
+      FLOOR(LATITUDE * 10) as LAT_BUCKET,
+      FLOOR(LONGITUDE * 10) as LON_BUCKET
+    FROM UC2_REFERENCE.DIM_CELL_SITE
+    WHERE LATITUDE IS NOT NULL AND LONGITUDE IS NOT NULL
+  ),
+  accounts AS (
+    SELECT ACCOUNT_ID, PRIMARY_SITE_ID, LATITUDE, LONGITUDE
+    FROM CUSTOMER_DATA.ACCOUNT
+    WHERE STATUS = 'active'
+  ),
+  account_buckets AS (
+    SELECT a.ACCOUNT_ID, a.LATITUDE, a.LONGITUDE,
+           FLOOR(a.LATITUDE * 10) + o.DLAT as LAT_BUCKET,
+           FLOOR(a.LONGITUDE * 10) + o.DLON as LON_BUCKET
+    FROM accounts a
+    CROSS JOIN (
+      SELECT DLAT, DLON
+      FROM (VALUES (-1), (0), (1)) lat(DLAT), (VALUES (-1), (0), (1)) lon(DLON)
+    ) o
+    WHERE a.LATITUDE IS NOT NULL AND a.LONGITUDE IS NOT NULL
+  ),
+  nearby AS (
+    SELECT b.ACCOUNT_ID, s.SITE_ID, HAVERSINE(b.LATITUDE, b.LONGITUDE, s.LATITUDE, s.LONGITUDE) as DISTANCE_KM
+    FROM account_buckets b
+    JOIN sites s ON s.LAT_BUCKET = b.LAT_BUCKET AND s.LON_BUCKET = b.LON_BUCKET
+    WHERE HAVERSINE(b.LATITUDE, b.LONGITUDE, s.LATITUDE, s.LONGITUDE) <= s.REACH_KM
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY b.ACCOUNT_ID ORDER BY DISTANCE_KM) <= 3
+  ),
+  candidates AS (
+    SELECT ACCOUNT_ID, SITE_ID, DISTANCE_KM, FALSE as PRIMARY_SITE FROM nearby
+    UNION ALL
+    SELECT a.ACCOUNT_ID, a.PRIMARY_SITE_ID, HAVERSINE(a.LATITUDE, a.LONGITUDE, s.LATITUDE, s.LONGITUDE), TRUE
+    FROM accounts a
+    LEFT JOIN sites s ON s.SITE_ID = a.PRIMARY_SITE_ID
+    WHERE a.PRIMARY_SITE_ID IS NOT NULL
+  )
+  SELECT ACCOUNT_ID, SITE_ID, DISTANCE_KM, PRIMARY_SITE
+  FROM candidates
+  QUALIFY ROW_NUMBER() OVER (PARTITION BY ACCOUNT_ID, SITE_ID ORDER BY PRIMARY_SITE DESC) = 1;
+
+  BEGIN TRANSACTION;
+
+  MERGE INTO INTEGRATION.CUSTOMER_SITE_MAPPING t
+  USING SITE_MAPPING_CANDIDATE s
+  ON t.ACCOUNT_ID = s.ACCOUNT_ID AND t.SITE_ID = s.SITE_ID
+  WHEN MATCHED THEN UPDATE SET
+    PRIMARY_SITE = s.PRIMARY_SITE,
+    DISTANCE_KM = s.DISTANCE_KM
+  WHEN NOT MATCHED THEN INSERT (
+    MAPPING_ID, CUSTOMER_ID, ACCOUNT_ID, SITE_ID, PRIMARY_SITE, COVERAGE_QUALITY, DISTANCE_KM, ASSIGNED_DATE, CREATED_DATE
+  ) VALUES (
+    'CSM-' || MD5(s.ACCOUNT_ID || '|' || s.SITE_ID),
+    s.ACCOUNT_ID, -- Complaints carry the account ID as CUSTOMER_ID
+    s.ACCOUNT_ID,
+    s.SITE_ID,
+    s.PRIMARY_SITE,
+    CASE
+      WHEN s.DISTANCE_KM IS NULL THEN NULL
+      WHEN s.DISTANCE_KM <= 2 THEN 'excellent'
+      WHEN s.DISTANCE_KM <= 5 THEN 'good'
+      WHEN s.DISTANCE_KM <= 8 THEN 'fair'
+      ELSE 'poor'
+    END,
+    s.DISTANCE_KM,
+    CURRENT_DATE(),
+    CURRENT_TIMESTAMP()
+  );
+
+  mapped := SQLROWCOUNT;
+
+  -- Drop pairs no longer in the source (moved primary site, closed account) so
+  -- each customer keeps a single primary row
+  DELETE FROM INTEGRATION.CUSTOMER_SITE_MAPPING t
+  WHERE NOT EXISTS (
+    SELECT 1 FROM SITE_MAPPING_CANDIDATE s
+    WHERE s.ACCOUNT_ID = t.ACCOUNT_ID AND s.SITE_ID = t.SITE_ID
+  );
+
+  removed := SQLROWCOUNT;
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS)
+  SELECT
+    UUID_STRING(),
+    'REFRESH_CUSTOMER_SITE_MAPPING',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :mapped,
+    OBJECT_CONSTRUCT('max_distance_km', :MAX_DISTANCE_KM, 'removed', :removed);
+
+  RETURN 'Customer site mapping refreshed: ' || mapped || ' mappings merged, ' || removed || ' removed';
+END;
+$$;
+
+CALL INTEGRATION.REFRESH_CUSTOMER_SITE_MAPPING();
+
+-- =====================================================================
+-- SECTION 3: LINKING PROCEDURE
+-- =====================================================================
+
+SELECT 'Creating incident linking procedure...' as STATUS;
+
+-- Procedure to link new complaints to network incidents
+-- 1. Stamped: complaints carrying NETWORK_INCIDENT_ID are range-joined to
+--    FACT_INCIDENTS (incident start <= complaint < start + MAX_LAG_HOURS).
+-- 2. Inferred: complaints are matched to incidents at their mapped sites via the
+--    (site, hour) index. Both new complaints x indexed incidents and existing
+--    complaints x newly indexed incidents are checked, so late incidents link too.
+-- Inferred confidence (capped at 99): site proximity (up to 40), time decay
+-- (35 * exp(-lag / 12h)), outage wording (20) and incident severity (5).
+-- Proximity and timing alone never infer a link: the complaint must mention an
+-- outage or carry a network category, so e.g. billing complaints are skipped.
+CREATE OR REPLACE PROCEDURE LINK_INCIDENT_COMPLAINTS(MAX_LAG_HOURS INT DEFAULT 72, MIN_CONFIDENCE INT DEFAULT 40)
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  new_complaints INT;
+  new_incidents INT;
+  new_links INT;
+  inferred_links INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS INCIDENT_COMPLAINT_BATCH (
+    COMPLAINT_ID VARCHAR(50),
+    CASE_ID VARCHAR(50),
+    CUSTOMER_ID VARCHAR(50),
+    COMPLAINT_TIMESTAMP TIMESTAMP_NTZ,
+    COMPLAINT_TEXT VARCHAR,
+    CATEGORY VARCHAR(100),
+    NETWORK_INCIDENT_ID VARCHAR(50)
+  );
+  TRUNCATE TABLE INCIDENT_COMPLAINT_BATCH;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS NEW_INCIDENT_INDEX_BATCH (
+    SITE_ID VARCHAR(50),
+    BUCKET_HOUR TIMESTAMP_NTZ,
+    INCIDENT_ID VARCHAR(50),
+    INCIDENT_TIMESTAMP TIMESTAMP_NTZ,
+    SEVERITY VARCHAR(20)
+  );
+  TRUNCATE TABLE NEW_INCIDENT_INDEX_BATCH;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS INCIDENT_LINK_BATCH (
+    LINK_ID VARCHAR(50),
+    INCIDENT_ID VARCHAR(50),
+    CASE_ID VARCHAR(50),
+    COMPLAINT_ID VARCHAR(50),
+    CUSTOMER_ID VARCHAR(50),
+    INCIDENT_TIMESTAMP TIMESTAMP_NTZ,
+    COMPLAINT_TIMESTAMP TIMESTAMP_NTZ,
+    LAG_MINUTES INT,
+    MENTIONS_OUTAGE BOOLEAN,
+    CORRELATION_CONFIDENCE INT,
+    SITE_ID VARCHAR(50)
+  );
+  TRUNCATE TABLE INCIDENT_LINK_BATCH;
+
+  BEGIN TRANSACTION;
+
+  -- Drains, links and histogram increments commit together so a failure leaves both stream offsets unmoved
+  INSERT INTO INCIDENT_COMPLAINT_BATCH
+  SELECT COMPLAINT_ID, CASE_ID, CUSTOMER_ID, COMPLAINT_TIMESTAMP, COMPLAINT_TEXT, CATEGORY, NETWORK_INCIDENT_ID
+  FROM COMPLAINTS.UNIFIED_COMPLAINT_INCIDENT_STREAM
+  WHERE METADATA$ACTION = 'INSERT';
+
+  new_complaints := SQLROWCOUNT;
+
+  -- Index new incidents under their site for each hour of the linking window
+  INSERT INTO NEW_INCIDENT_INDEX_BATCH
+  SELECT
+    i.SITE_ID,
+    DATEADD(hour, h.OFFSET_HOURS, DATE_TRUNC('hour', i.INCIDENT_TIMESTAMP)),
+    i.INCIDENT_ID,
+    i.INCIDENT_TIMESTAMP,
+    i.SEVERITY
+  FROM UC2_REFERENCE.FACT_INCIDENTS_LINK_STREAM i
+  CROSS JOIN (
+    SELECT ROW_NUMBER() OVER (ORDER BY SEQ4()) - 1 as OFFSET_HOURS
+    FROM TABLE(GENERATOR(ROWCOUNT => 169))
+  ) h
+  WHERE i.METADATA$ACTION = 'INSERT'
+    AND i.SITE_ID IS NOT NULL
+    AND i.INCIDENT_TIMESTAMP IS NOT NULL
+    AND h.OFFSET_HOURS <= :MAX_LAG_HOURS;
+
+  new_incidents := (SELECT COUNT(DISTINCT INCIDENT_ID) FROM NEW_INCIDENT_INDEX_BATCH);
+
+  INSERT INTO INTEGRATION.INCIDENT_SITE_HOUR_INDEX (SITE_ID, BUCKET_HOUR, INCIDENT_ID, INCIDENT_TIMESTAMP, SEVERITY)
+  SELECT SITE_ID, BUCKET_HOUR, INCIDENT_ID, INCIDENT_TIMESTAMP, SEVERITY
+  FROM NEW_INCIDENT_INDEX_BATCH;
+
+  INSERT INTO INCIDENT_LINK_BATCH
+  SELECT
+    'NCL-' || MD5(c.COMPLAINT_ID || '|' || i.INCIDENT_ID),
+    i.INCIDENT_ID,
+    c.CASE_ID,
+    c.COMPLAINT_ID,
+    c.CUSTOMER_ID,
+    i.INCIDENT_TIMESTAMP,
+    c.COMPLAINT_TIMESTAMP,
+    DATEDIFF(minute, i.INCIDENT_TIMESTAMP, c.COMPLAINT_TIMESTAMP),
+    REGEXP_LIKE(LOWER(c.COMPLAINT_TEXT), '.*(outage|no signal|no service|no network|network down|dropped call|sem rede).*'),
+    100, -- Incident stamped on the complaint
+    i.SITE_ID
+  FROM INCIDENT_COMPLAINT_BATCH c
+  JOIN UC2_REFERENCE.FACT_INCIDENTS i
+    ON i.INCIDENT_ID = c.NETWORK_INCIDENT_ID
+    AND c.COMPLAINT_TIMESTAMP >= i.INCIDENT_TIMESTAMP
+    AND c.COMPLAINT_TIMESTAMP < DATEADD(hour, :MAX_LAG_HOURS, i.INCIDENT_TIMESTAMP);
+
+  -- Inferred links through the customer's mapped sites
+  INSERT INTO INCIDENT_LINK_BATCH
+  WITH candidates AS (
+    SELECT
+      c.COMPLAINT_ID, c.CASE_ID, c.CUSTOMER_ID, c.COMPLAINT_TIMESTAMP,
+      REGEXP_LIKE(LOWER(c.COMPLAINT_TEXT), '.*(outage|no signal|no service|no network|network down|dropped call|sem rede).*') as MENTIONS_OUTAGE,
+      REGEXP_LIKE(LOWER(c.CATEGORY), '.*(network|outage|coverage|signal).*') as NETWORK_CATEGORY,
+      x.INCIDENT_ID, x.INCIDENT_TIMESTAMP, x.SEVERITY, x.SITE_ID, m.PRIMARY_SITE, m.DISTANCE_KM
+    FROM INCIDENT_COMPLAINT_BATCH c
+    JOIN INTEGRATION.CUSTOMER_SITE_MAPPING m ON m.CUSTOMER_ID = c.CUSTOMER_ID
+    JOIN INTEGRATION.INCIDENT_SITE_HOUR_INDEX x
+      ON x.SITE_ID = m.SITE_ID
+      AND x.BUCKET_HOUR = DATE_TRUNC('hour', c.COMPLAINT_TIMESTAMP)
+    WHERE c.COMPLAINT_TIMESTAMP >= x.INCIDENT_TIMESTAMP
+    UNION ALL
+    SELECT
+      u.COMPLAINT_ID, u.CASE_ID, u.CUSTOMER_ID, u.COMPLAINT_TIMESTAMP,
+      REGEXP_LIKE(LOWER(u.COMPLAINT_TEXT), '.*(outage|no signal|no service|no network|network down|dropped call|sem rede).*'),
+      REGEXP_LIKE(LOWER(u.CATEGORY), '.*(network|outage|coverage|signal).*'),
+      x.INCIDENT_ID, x.INCIDENT_TIMESTAMP, x.SEVERITY, x.SITE_ID, m.PRIMARY_SITE, m.DISTANCE_KM
+    FROM NEW_INCIDENT_INDEX_BATCH x
+    JOIN INTEGRATION.CUSTOMER_SITE_MAPPING m ON m.SITE_ID = x.SITE_ID
+    JOIN COMPLAINTS.UNIFIED_COMPLAINT u
+      ON u.CUSTOMER_ID = m.CUSTOMER_ID
+      AND DATE_TRUNC('hour', u.COMPLAINT_TIMESTAMP) = x.BUCKET_HOUR
+    WHERE u.COMPLAINT_TIMESTAMP >= x.INCIDENT_TIMESTAMP
+  ),
+  scored AS (
+    SELECT
+      *,
+      DATEDIFF(minute, INCIDENT_TIMESTAMP, COMPLAINT_TIMESTAMP) as LAG_MINUTES,
+      LEAST(99, ROUND(
+        IFF(PRIMARY_SITE, 40, 25 * GREATEST(0, 1 - COALESCE(DISTANCE_KM, 8) / 10))
+        + 35 * EXP(-DATEDIFF(minute, INCIDENT_TIMESTAMP, COMPLAINT_TIMESTAMP) / 720.0)
+        + IFF(MENTIONS_OUTAGE, 20, 0)
+        + IFF(UPPER(SEVERITY) IN ('CRITICAL', 'HIGH'), 5, 0)
+      )) as CONFIDENCE
+    FROM candidates
+  )
+  SELECT
+    'NCL-' || MD5(s.COMPLAINT_ID || '|' || s.INCIDENT_ID),
+    s.INCIDENT_ID,
+    s.CASE_ID,
+    s.COMPLAINT_ID,
+    s.CUSTOMER_ID,
+    s.INCIDENT_TIMESTAMP,
+    s.COMPLAINT_TIMESTAMP,
+    s.LAG_MINUTES,
+    s.MENTIONS_OUTAGE,
+    s.CONFIDENCE,
+    s.SITE_ID
+  FROM scored s
+  LEFT JOIN INCIDENT_LINK_BATCH b ON b.COMPLAINT_ID = s.COMPLAINT_ID AND b.INCIDENT_ID = s.INCIDENT_ID
+  WHERE b.COMPLAINT_ID IS NULL
+    AND (s.MENTIONS_OUTAGE OR s.NETWORK_CATEGORY)
+    AND s.CONFIDENCE >= :MIN_CONFIDENCE
+  QUALIFY ROW_NUMBER() OVER (PARTITION BY s.COMPLAINT_ID, s.INCIDENT_ID ORDER BY s.CONFIDENCE DESC) = 1;
+
+  inferred_links := SQLROWCOUNT;
+
+  -- Drop pairs linked in an earlier run so histograms are only incremented once
+  DELETE FROM INCIDENT_LINK_BATCH b
+  USING INTEGRATION.NETWORK_COMPLAINT_LINK t
+  WHERE t.COMPLAINT_ID = b.COMPLAINT_ID AND t.INCIDENT_ID = b.INCIDENT_ID;
+
+  INSERT INTO INTEGRATION.NETWORK_COMPLAINT_LINK (
+    LINK_ID, INCIDENT_ID, CASE_ID, COMPLAINT_ID, CUSTOMER_ID, INCIDENT_TIMESTAMP, COMPLAINT_TIMESTAMP,
+    TIME_BETWEEN_INCIDENT_AND_COMPLAINT_MINUTES, COMPLAINT_MENTIONS_OUTAGE, CORRELATION_CONFIDENCE, SITE_ID, CREATED_DATE
+  )
+  SELECT
+    LINK_ID, INCIDENT_ID, CASE_ID, COMPLAINT_ID, CUSTOMER_ID, INCIDENT_TIMESTAMP, COMPLAINT_TIMESTAMP,
+    LAG_MINUTES, MENTIONS_OUTAGE, CORRELATION_CONFIDENCE, SITE_ID, CURRENT_TIMESTAMP()
+  FROM INCIDENT_LINK_BATCH;
+
+  new_links := SQLROWCOUNT;
+
+  -- Fold the new links into the per-incident lag histograms
+  MERGE INTO INTEGRATION.INCIDENT_LAG_HISTOGRAM t
+  USING (
+    SELECT INCIDENT_ID, INCIDENT_TIMESTAMP, FLOOR(LAG_MINUTES / 60) as LAG_HOUR, COUNT(*) as COMPLAINT_COUNT
+    FROM INCIDENT_LINK_BATCH
+    GROUP BY INCIDENT_ID, INCIDENT_TIMESTAMP, FLOOR(LAG_MINUTES / 60)
+  ) s
+  ON t.INCIDENT_ID = s.INCIDENT_ID AND t.LAG_HOUR = s.LAG_HOUR
+  WHEN MATCHED THEN UPDATE SET
+    COMPLAINT_COUNT = t.COMPLAINT_COUNT + s.COMPLAINT_COUNT,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (INCIDENT_ID, INCIDENT_TIMESTAMP, LAG_HOUR, COMPLAINT_COUNT, UPDATED_AT)
+  VALUES (s.INCIDENT_ID, s.INCIDENT_TIMESTAMP, s.LAG_HOUR, s.COMPLAINT_COUNT, CURRENT_TIMESTAMP());
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS)
+  SELECT
+    UUID_STRING(),
+    'LINK_INCIDENT_COMPLAINTS',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :new_complaints,
+    OBJECT_CONSTRUCT(
+      'new_incidents', :new_incidents,
+      'new_links', :new_links,
+      'inferred_links', :inferred_links,
+      'max_lag_hours', :MAX_LAG_HOURS,
+      'min_confidence', :MIN_CONFIDENCE
+    );
+
+  RETURN 'Incident linking complete: ' || new_complaints || ' new complaints, ' || new_incidents || ' new incidents, '
+    || new_links || ' links created';
+END;
+$$;
+
+-- =====================================================================
+-- SECTION 4: H3 GRID ROLLUP
+-- =====================================================================
+
+SELECT 'Creating H3 grid rollup procedure...' as STATUS;
+
+-- Procedure to fold new complaints into the hourly H3 cell counts
+-- Complaints are placed at their account's primary site, read from ACCOUNT
+-- rather than the nightly site mapping so new accounts are gridded at once; the
+-- app rolls cells up to coarser resolutions with H3_CELL_TO_PARENT.
+CREATE OR REPLACE PROCEDURE ROLLUP_COMPLAINT_H3_GRID()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  new_complaints INT;
+  cells_touched INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS H3_COMPLAINT_BATCH (
+    H3_CELL VARCHAR(20),
+    HOUR_START TIMESTAMP_NTZ,
+    REGION VARCHAR(50),
+    IS_NETWORK BOOLEAN
+  );
+  TRUNCATE TABLE H3_COMPLAINT_BATCH;
+
+  BEGIN TRANSACTION;
+
+  INSERT INTO H3_COMPLAINT_BATCH
+  SELECT
+    H3_LATLNG_TO_CELL_STRING(s.LATITUDE, s.LONGITUDE, 7),
+    DATE_TRUNC('hour', c.COMPLAINT_TIMESTAMP),
+    s.REGION,
+    c.NETWORK_INCIDENT_ID IS NOT NULL
+  FROM COMPLAINTS.UNIFIED_COMPLAINT_GEO_STREAM c
+  JOIN CUSTOMER_DATA.ACCOUNT a ON a.ACCOUNT_ID = c.CUSTOMER_ID -- Complaints carry the account ID as CUSTOMER_ID
+  JOIN UC2_REFERENCE.DIM_CELL_SITE s ON s.SITE_ID = a.PRIMARY_SITE_ID
+  WHERE c.METADATA$ACTION = 'INSERT'
+    AND c.COMPLAINT_TIMESTAMP IS NOT NULL
+    AND s.LATITUDE IS NOT NULL
+    AND s.LONGITUDE IS NOT NULL;
+
+  new_complaints := SQLROWCOUNT;
+
+  MERGE INTO INTEGRATION.COMPLAINT_H3_HOURLY t
+  USING (
+    SELECT
+      H3_CELL,
+      HOUR_START,
+      ANY_VALUE(REGION) as REGION,
+      COUNT(*) as COMPLAINT_COUNT,
+      COUNT_IF(IS_NETWORK) as NETWORK_COMPLAINTS
+    FROM H3_COMPLAINT_BATCH
+    GROUP BY H3_CELL, HOUR_START
+  ) s
+  ON t.H3_CELL = s.H3_CELL AND t.HOUR_START = s.HOUR_START
+  WHEN MATCHED THEN UPDATE SET
+    COMPLAINT_COUNT = t.COMPLAINT_COUNT + s.COMPLAINT_COUNT,
+    NETWORK_COMPLAINTS = t.NETWORK_COMPLAINTS + s.NETWORK_COMPLAINTS,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (H3_CELL, HOUR_START, REGION, COMPLAINT_COUNT, NETWORK_COMPLAINTS, UPDATED_AT)
+  VALUES (s.H3_CELL, s.HOUR_START, s.REGION, s.COMPLAINT_COUNT, s.NETWORK_COMPLAINTS, CURRENT_TIMESTAMP());
+
+  cells_touched := SQLROWCOUNT;
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS)
+  SELECT
+    UUID_STRING(),
+    'ROLLUP_COMPLAINT_H3_GRID',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :new_complaints,
+    OBJECT_CONSTRUCT('cell_hours_touched', :cells_touched, 'h3_resolution', 7);
+
+  RETURN 'H3 grid rollup complete: ' || new_complaints || ' complaints, ' || cells_touched || ' cell-hours updated';
+END;
+$$;
+
+-- =====================================================================
+-- SECTION 5: INCIDENT SUMMARY
+-- =====================================================================
+
+SELECT 'Creating incident summary procedure...' as STATUS;
+
+-- Procedure to apply complaint changes to the per-incident summary
+-- The stream is not append-only: an update arrives as DELETE + INSERT, so counts
+-- are applied with a -1/+1 sign and stay exact when a complaint is resolved or
+-- recategorized. Customer sketches only grow (re-adding a customer is a no-op).
+CREATE OR REPLACE PROCEDURE UPDATE_INCIDENT_SUMMARY()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  changed_rows INT;
+  summary_rows INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  -- Drain the stream once; the delta holds one aggregated row per summary key
+  CREATE TEMPORARY TABLE IF NOT EXISTS INCIDENT_SUMMARY_DELTA (
+    INCIDENT_ID VARCHAR(50),
+    COMPLAINT_DATE DATE,
+    CATEGORY VARCHAR(100),
+    COMPLAINT_COUNT INT,
+    RESOLVED_COUNT INT,
+    CUSTOMER_SKETCH OBJECT,
+    FIRST_COMPLAINT TIMESTAMP_NTZ,
+    LAST_COMPLAINT TIMESTAMP_NTZ,
+    COMPLAINT_EPOCH_SUM NUMBER(38,0),
+    REVENUE_AT_RISK DECIMAL(15,2),
+    CHANGED_ROWS INT
+  );
+  TRUNCATE TABLE INCIDENT_SUMMARY_DELTA;
+
+  BEGIN TRANSACTION;
+
+  INSERT INTO INCIDENT_SUMMARY_DELTA
+  WITH changes AS (
+    SELECT
+      COMPLAINT_ID,
+      CUSTOMER_ID,
+      NETWORK_INCIDENT_ID,
+      COMPLAINT_TIMESTAMP,
+      COALESCE(CATEGORY, 'Uncategorized') as CATEGORY,
+      STATUS,
+      IFF(METADATA$ACTION = 'INSERT', 1, -1) as SIGN,
+      METADATA$ISUPDATE as IS_UPDATE
+    FROM COMPLAINTS.UNIFIED_COMPLAINT_SUMMARY_STREAM
+    WHERE NETWORK_INCIDENT_ID IS NOT NULL
+  ),
+  -- New complaints from customers who already complained about the same incident
+  repeat_complaints AS (
+    SELECT DISTINCT ch.COMPLAINT_ID
+    FROM changes ch
+    JOIN COMPLAINTS.UNIFIED_COMPLAINT p
+      ON p.NETWORK_INCIDENT_ID = ch.NETWORK_INCIDENT_ID
+      AND p.CUSTOMER_ID = ch.CUSTOMER_ID
+      AND (p.COMPLAINT_TIMESTAMP < ch.COMPLAINT_TIMESTAMP
+           OR (p.COMPLAINT_TIMESTAMP = ch.COMPLAINT_TIMESTAMP AND p.COMPLAINT_ID < ch.COMPLAINT_ID))
+    WHERE ch.SIGN = 1 AND NOT ch.IS_UPDATE
+  ),
+  customer_revenue AS (
+    SELECT cm.ACCOUNT_ID, SUM(s.MONTHLY_CHARGE) as MONTHLY_REVENUE
+    FROM BILLING_DATA.CUSTOMER_MASTER cm
+    JOIN BILLING_DATA.SUBSCRIPTION s
+      ON s.CUSTOMER_ID = cm.CUSTOMER_ID
+      AND s.STATUS = 'active'
+    WHERE cm.ACCOUNT_ID IN (SELECT CUSTOMER_ID FROM changes)
+    GROUP BY cm.ACCOUNT_ID
+  )
+  SELECT
+    ch.NETWORK_INCIDENT_ID,
+    TO_DATE(ch.COMPLAINT_TIMESTAMP),
+    ch.CATEGORY,
+    SUM(ch.SIGN),
+    SUM(IFF(ch.STATUS IN ('Resolved', 'Closed'), ch.SIGN, 0)),
+    HLL_EXPORT(HLL_ACCUMULATE(IFF(ch.SIGN = 1, ch.CUSTOMER_ID, NULL))),
+    MIN(IFF(ch.SIGN = 1, ch.COMPLAINT_TIMESTAMP, NULL)),
+    MAX(IFF(ch.SIGN = 1, ch.COMPLAINT_TIMESTAMP, NULL)),
+    SUM(ch.SIGN * DATE_PART(epoch_second, ch.COMPLAINT_TIMESTAMP)),
+    SUM(IFF(ch.SIGN = 1 AND NOT ch.IS_UPDATE AND rc.COMPLAINT_ID IS NULL, COALESCE(r.MONTHLY_REVENUE, 0), 0)),
+    COUNT(*)
+  FROM changes ch
+  LEFT JOIN repeat_complaints rc ON rc.COMPLAINT_ID = ch.COMPLAINT_ID
+  LEFT JOIN customer_revenue r ON r.ACCOUNT_ID = ch.CUSTOMER_ID
+  GROUP BY ch.NETWORK_INCIDENT_ID, TO_DATE(ch.COMPLAINT_TIMESTAMP), ch.CATEGORY;
+
+  changed_rows := (SELECT COALESCE(SUM(CHANGED_ROWS), 0) FROM INCIDENT_SUMMARY_DELTA);
+
+  MERGE INTO INTEGRATION.INCIDENT_COMPLAINT_SUMMARY t
+  USING (
+    WITH sketch_inputs AS (
+      SELECT INCIDENT_ID, COMPLAINT_DATE, CATEGORY, CUSTOMER_SKETCH
+      FROM INCIDENT_SUMMARY_DELTA
+      UNION ALL
+      SELECT t.INCIDENT_ID, t.COMPLAINT_DATE, t.CATEGORY, t.CUSTOMER_SKETCH
+      FROM INTEGRATION.INCIDENT_COMPLAINT_SUMMARY t
+      JOIN INCIDENT_SUMMARY_DELTA d
+        ON d.INCIDENT_ID = t.INCIDENT_ID
+        AND d.COMPLAINT_DATE = t.COMPLAINT_DATE
+        AND d.CATEGORY = t.CATEGORY
+    ),
+    sketches AS (
+      SELECT INCIDENT_ID, COMPLAINT_DATE, CATEGORY, HLL_EXPORT(HLL_COMBINE(HLL_IMPORT(CUSTOMER_SKETCH))) as CUSTOMER_SKETCH
+      FROM sketch_inputs
+      WHERE CUSTOMER_SKETCH IS NOT NULL
+      GROUP BY INCIDENT_ID, COMPLAINT_DATE, CATEGORY
+    )
+    SELECT d.*, sk.CUSTOMER_SKETCH as MERGED_SKETCH
+    FROM INCIDENT_SUMMARY_DELTA d
+    LEFT JOIN sketches sk
+      ON sk.INCIDENT_ID = d.INCIDENT_ID
+      AND sk.COMPLAINT_DATE = d.COMPLAINT_DATE
+      AND sk.CATEGORY = d.CATEGORY
+  ) s
+  ON t.INCIDENT_ID = s.INCIDENT_ID AND t.COMPLAINT_DATE = s.COMPLAINT_DATE AND t.CATEGORY = s.CATEGORY
+  WHEN MATCHED THEN UPDATE SET
+    COMPLAINT_COUNT = t.COMPLAINT_COUNT + s.COMPLAINT_COUNT,
+    RESOLVED_COUNT = t.RESOLVED_COUNT + s.RESOLVED_COUNT,
+    CUSTOMER_SKETCH = s.MERGED_SKETCH,
+    FIRST_COMPLAINT = LEAST(COALESCE(t.FIRST_COMPLAINT, s.FIRST_COMPLAINT), COALESCE(s.FIRST_COMPLAINT, t.FIRST_COMPLAINT)),
+    LAST_COMPLAINT = GREATEST(COALESCE(t.LAST_COMPLAINT, s.LAST_COMPLAINT), COALESCE(s.LAST_COMPLAINT, t.LAST_COMPLAINT)),
+    COMPLAINT_EPOCH_SUM = t.COMPLAINT_EPOCH_SUM + s.COMPLAINT_EPOCH_SUM,
+    REVENUE_AT_RISK = t.REVENUE_AT_RISK + s.REVENUE_AT_RISK,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (
+    INCIDENT_ID, COMPLAINT_DATE, CATEGORY, COMPLAINT_COUNT, RESOLVED_COUNT, CUSTOMER_SKETCH,
+    FIRST_COMPLAINT, LAST_COMPLAINT, COMPLAINT_EPOCH_SUM, REVENUE_AT_RISK, UPDATED_AT
+  ) VALUES (
+    s.INCIDENT_ID, s.COMPLAINT_DATE, s.CATEGORY, s.COMPLAINT_COUNT, s.RESOLVED_COUNT, s.MERGED_SKETCH,
+    s.FIRST_COMPLAINT, s.LAST_COMPLAINT, s.COMPLAINT_EPOCH_SUM, s.REVENUE_AT_RISK, CURRENT_TIMESTAMP()
+  );
+
+  summary_rows := SQLROWCOUNT;
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS)
+  SELECT
+    UUID_STRING(),
+    'UPDATE_INCIDENT_SUMMARY',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :changed_rows,
+    OBJECT_CONSTRUCT('summary_rows_merged', :summary_rows);
+
+  RETURN 'Incident summary updated: ' || changed_rows || ' complaint changes, ' || summary_rows || ' summary rows merged';
+END;
+$$;
+
+-- =====================================================================
+-- SECTION 6: INCREMENTAL PIPELINE (STREAMS & TASKS)
+-- =====================================================================
+
+SELECT 'Creating incident linking streams and tasks...' as STATUS;
+
+-- Streams are kept across re-runs: replacing one would replay history into the
+-- incremental tables below and double count it
+-- New complaints to link (initial rows backfill existing complaints on first run)
+CREATE STREAM IF NOT EXISTS COMPLAINTS.UNIFIED_COMPLAINT_INCIDENT_STREAM
+    ON TABLE COMPLAINTS.UNIFIED_COMPLAINT
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'New complaints for incident linking';
+
+-- New incidents to index (initial rows index existing incidents on first run)
+CREATE STREAM IF NOT EXISTS UC2_REFERENCE.FACT_INCIDENTS_LINK_STREAM
+    ON TABLE UC2_REFERENCE.FACT_INCIDENTS
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'New network incidents for the site-hour index';
+
+-- Backfill links and histograms for existing complaints
+CALL INTEGRATION.LINK_INCIDENT_COMPLAINTS();
+
+CREATE OR REPLACE TASK INTEGRATION.INCIDENT_LINK_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '5 MINUTE'
+    COMMENT = 'Links newly ingested complaints and incidents'
+WHEN
+    SYSTEM$STREAM_HAS_DATA('COMPLAINTS.UNIFIED_COMPLAINT_INCIDENT_STREAM')
+    OR SYSTEM$STREAM_HAS_DATA('UC2_REFERENCE.FACT_INCIDENTS_LINK_STREAM')
+AS
+    CALL INTEGRATION.LINK_INCIDENT_COMPLAINTS();
+
+ALTER TASK INTEGRATION.INCIDENT_LINK_TASK RESUME;
+
+-- Pick up new accounts and site changes nightly
+CREATE OR REPLACE TASK INTEGRATION.CUSTOMER_SITE_MAPPING_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = 'USING CRON 0 1 * * * UTC'
+    COMMENT = 'Nightly refresh of customer to site mapping'
+AS
+    CALL INTEGRATION.REFRESH_CUSTOMER_SITE_MAPPING();
+
+ALTER TASK INTEGRATION.CUSTOMER_SITE_MAPPING_TASK RESUME;
+
+-- New complaints to place on the H3 grid (own stream so it drains independently)
+CREATE STREAM IF NOT EXISTS COMPLAINTS.UNIFIED_COMPLAINT_GEO_STREAM
+    ON TABLE COMPLAINTS.UNIFIED_COMPLAINT
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'New complaints for the H3 grid rollup';
+
+-- Backfill the grid with existing complaints
+CALL INTEGRATION.ROLLUP_COMPLAINT_H3_GRID();
+
+CREATE OR REPLACE TASK INTEGRATION.COMPLAINT_H3_GRID_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '5 MINUTE'
+    COMMENT = 'Folds newly ingested complaints into the H3 grid'
+WHEN
+    SYSTEM$STREAM_HAS_DATA('COMPLAINTS.UNIFIED_COMPLAINT_GEO_STREAM')
+AS
+    CALL INTEGRATION.ROLLUP_COMPLAINT_H3_GRID();
+
+ALTER TASK INTEGRATION.COMPLAINT_H3_GRID_TASK RESUME;
+
+-- All complaint changes, including status updates, for the incident summary
+CREATE STREAM IF NOT EXISTS COMPLAINTS.UNIFIED_COMPLAINT_SUMMARY_STREAM
+    ON TABLE COMPLAINTS.UNIFIED_COMPLAINT
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'Complaint changes for the per-incident summary';
+
+-- Backfill the summary with existing complaints
+CALL INTEGRATION.UPDATE_INCIDENT_SUMMARY();
+
+CREATE OR REPLACE TASK INTEGRATION.INCIDENT_SUMMARY_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '5 MINUTE'
+    COMMENT = 'Applies complaint changes to the per-incident summary'
+WHEN
+    SYSTEM$STREAM_HAS_DATA('COMPLAINTS.UNIFIED_COMPLAINT_SUMMARY_STREAM')
+AS
+    CALL INTEGRATION.UPDATE_INCIDENT_SUMMARY();
+
+ALTER TASK INTEGRATION.INCIDENT_SUMMARY_TASK RESUME;
+
+-- =====================================================================
+-- SECTION 7: SUMMARY
+-- =====================================================================
+
+SELECT '===========================================================' as SUMMARY
+UNION ALL SELECT 'NETWORK CORRELATION COMPLETE!'
+UNION ALL SELECT '==========================================================='
+UNION ALL SELECT ''
+UNION ALL SELECT 'Incident Linking:'
+UNION ALL SELECT '  - Customer Site Mappings: ' || (SELECT COUNT(*) FROM INTEGRATION.CUSTOMER_SITE_MAPPING)
+UNION ALL SELECT '  - Indexed Incidents: ' || (SELECT COUNT(DISTINCT INCIDENT_ID) FROM INTEGRATION.INCIDENT_SITE_HOUR_INDEX)
+UNION ALL SELECT '  - Complaint Links: ' || (SELECT COUNT(*) FROM INTEGRATION.NETWORK_COMPLAINT_LINK)
+UNION ALL SELECT '  - Inferred Links (site/time): ' || (SELECT COUNT(*) FROM INTEGRATION.NETWORK_COMPLAINT_LINK WHERE CORRELATION_CONFIDENCE < 100)
+UNION ALL SELECT '  - Incidents with Lag Histograms: ' || (SELECT COUNT(DISTINCT INCIDENT_ID) FROM INTEGRATION.INCIDENT_LAG_HISTOGRAM)
+UNION ALL SELECT '  - Median Lag (minutes): ' || COALESCE((SELECT MEDIAN(TIME_BETWEEN_INCIDENT_AND_COMPLAINT_MINUTES)::VARCHAR FROM INTEGRATION.NETWORK_COMPLAINT_LINK), 'n/a')
+UNION ALL SELECT '  - Link Task: INCIDENT_LINK_TASK (every 5 minutes)'
+UNION ALL SELECT '  - Mapping Task: CUSTOMER_SITE_MAPPING_TASK (daily 01:00 UTC)'
+UNION ALL SELECT ''
+UNION ALL SELECT 'Incident Summary:'
+UNION ALL SELECT '  - Incidents Summarized: ' || (SELECT COUNT(DISTINCT INCIDENT_ID) FROM INTEGRATION.INCIDENT_COMPLAINT_SUMMARY)
+UNION ALL SELECT '  - Summary Rows: ' || (SELECT COUNT(*) FROM INTEGRATION.INCIDENT_COMPLAINT_SUMMARY)
+UNION ALL SELECT '  - Summary Task: INCIDENT_SUMMARY_TASK (every 5 minutes)'
+UNION ALL SELECT ''
+UNION ALL SELECT 'H3 Grid:'
+UNION ALL SELECT '  - Cells with Complaints: ' || (SELECT COUNT(DISTINCT H3_CELL) FROM INTEGRATION.COMPLAINT_H3_HOURLY)
+UNION ALL SELECT '  - Cell-Hours: ' || (SELECT COUNT(*) FROM INTEGRATION.COMPLAINT_H3_HOURLY)
+UNION ALL SELECT '  - Rollup Task: COMPLAINT_H3_GRID_TASK (every 5 minutes)'
+UNION ALL SELECT ''
+UNION ALL SELECT '===========================================================';
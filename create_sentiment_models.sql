@@ -52,16 +52,86 @@ BEGIN
 END;
 $$;
 
+-- Run log shared by the incremental pipelines (row counts, timing, per-run details)
+CREATE TABLE IF NOT EXISTS PIPELINE_RUN_LOG (
+    RUN_ID VARCHAR(50) PRIMARY KEY,
+    PIPELINE_NAME VARCHAR(100) NOT NULL,
+    STARTED_AT TIMESTAMP_NTZ NOT NULL,
+    FINISHED_AT TIMESTAMP_NTZ,
+    DURATION_MS INT,
+    ROWS_PROCESSED INT,
+    DETAILS VARIANT, -- Pipeline-specific counters (tiers, thresholds, savings)
+    CREATED_DATE TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Execution log for sentiment and analytics pipelines';
+
+-- Score object from lexicon keyword hit counts (helper for LEXICON_SENTIMENT)
+CREATE OR REPLACE FUNCTION LEXICON_SCORE_FROM_HITS(POS INT, NEG INT)
+RETURNS OBJECT
+LANGUAGE SQL
+AS
+$$
+    OBJECT_CONSTRUCT(
+        'score', IFF(POS + NEG = 0, 0, ROUND((POS - NEG) / (POS + NEG + 1), 4)),
+        'confidence', IFF(POS + NEG = 0, 0, ROUND(ABS(POS - NEG) / (POS + NEG + 1), 4)),
+        'positive_hits', POS,
+        'negative_hits', NEG
+    )
+$$;
+
+-- Fast lexicon scorer - first tier of the sentiment cascade
+-- Returns score (-1.0 to 1.0), confidence (0.0 to 1.0) and keyword hit counts
+-- Kept as a scalar expression (no FROM subquery) so it can be called per row
+CREATE OR REPLACE FUNCTION LEXICON_SENTIMENT(TEXT_INPUT VARCHAR)
+RETURNS OBJECT
+LANGUAGE SQL
+AS
+$$
+    SENTIMENT.LEXICON_SCORE_FROM_HITS(
+        REGEXP_COUNT(LOWER(TEXT_INPUT),
+            '\\b(thank|thanks|great|excellent|happy|satisfied|helpful|resolved|appreciate|perfect|amazing|fantastic|quick|love)\\b'),
+        REGEXP_COUNT(LOWER(TEXT_INPUT),
+            '\\b(terrible|horrible|worst|awful|unacceptable|furious|angry|frustrated|frustrating|disappointed|ridiculous|useless|fed up|overcharged|cancel)\\b')
+    )
+$$;
+
 -- Procedure to batch update sentiment scores
-CREATE OR REPLACE PROCEDURE UPDATE_SENTIMENT_SCORES()
+-- RUN_MODE 'cortex'  : every new complaint is scored by Cortex (original behaviour)
+-- RUN_MODE 'cascade' : the lexicon scorer handles clearly positive/negative texts,
+--                      only texts below CONFIDENCE_THRESHOLD are sent to Cortex
+CREATE OR REPLACE PROCEDURE UPDATE_SENTIMENT_SCORES(
+    RUN_MODE VARCHAR DEFAULT 'cortex',
+    CONFIDENCE_THRESHOLD FLOAT DEFAULT 0.6
+)
 RETURNS STRING
 LANGUAGE SQL
 AS
 $$
 DECLARE
-  rows_inserted INT;
+  run_started TIMESTAMP_NTZ;
+  use_cascade BOOLEAN;
+  lexicon_rows INT DEFAULT 0;
+  cortex_rows INT DEFAULT 0;
+  chars_avoided INT DEFAULT 0;
+  pct_avoided FLOAT DEFAULT 0;
+  invalid_run_mode EXCEPTION (-20001, 'Unknown RUN_MODE - expected ''cortex'' or ''cascade''');
 BEGIN
-  -- Insert sentiment scores for complaints
+  IF (LOWER(RUN_MODE) NOT IN ('cortex', 'cascade')) THEN
+    RAISE invalid_run_mode;
+  END IF;
+
+  run_started := CURRENT_TIMESTAMP();
+  use_cascade := (LOWER(RUN_MODE) = 'cascade');
+
+  -- Stage unscored complaints once, with their lexicon result
+  CREATE OR REPLACE TEMPORARY TABLE SENTIMENT_BATCH AS
+  SELECT 
+    c.COMPLAINT_ID,
+    c.COMPLAINT_TEXT,
+    SENTIMENT.LEXICON_SENTIMENT(c.COMPLAINT_TEXT) as LEXICON
+  FROM COMPLAINTS.UNIFIED_COMPLAINT c
+  WHERE c.COMPLAINT_ID NOT IN (SELECT COMPLAINT_ID FROM SENTIMENT.SENTIMENT_SCORE);
+
+  -- Tier 1: confident lexicon results (cascade mode only)
   INSERT INTO SENTIMENT.SENTIMENT_SCORE (
     SENTIMENT_ID,
     COMPLAINT_ID,
@@ -73,24 +143,92 @@ BEGIN
     CREATED_DATE
   )
   SELECT 
-    'SEN-' || MD5(c.COMPLAINT_ID) as SENTIMENT_ID,
-    c.COMPLAINT_ID,
+    'SEN-' || MD5(b.COMPLAINT_ID) as SENTIMENT_ID,
+    b.COMPLAINT_ID,
+    CASE
+      WHEN b.LEXICON:score::FLOAT > 0 THEN 'Positive'
+      WHEN b.LEXICON:score::FLOAT < 0 THEN 'Negative'
+      ELSE 'Neutral' -- Only reached with CONFIDENCE_THRESHOLD <= 0
+    END as OVERALL_SENTIMENT,
+    b.LEXICON:score::FLOAT as SENTIMENT_SCORE,
+    b.LEXICON:confidence::FLOAT as CONFIDENCE_LEVEL,
+    CURRENT_TIMESTAMP() as ANALYZED_TIMESTAMP,
+    'lexicon_v1' as MODEL_VERSION,
+    CURRENT_TIMESTAMP() as CREATED_DATE
+  FROM SENTIMENT_BATCH b
+  WHERE :use_cascade
+    AND b.LEXICON:confidence::FLOAT >= :CONFIDENCE_THRESHOLD;
+  
+  lexicon_rows := SQLROWCOUNT;
+
+  -- Tier 2: Cortex for everything else (one SENTIMENT call per text)
+  INSERT INTO SENTIMENT.SENTIMENT_SCORE (
+    SENTIMENT_ID,
+    COMPLAINT_ID,
+    OVERALL_SENTIMENT,
+    SENTIMENT_SCORE,
+    CONFIDENCE_LEVEL,
+    ANALYZED_TIMESTAMP,
+    MODEL_VERSION,
+    CREATED_DATE
+  )
+  SELECT 
+    'SEN-' || MD5(s.COMPLAINT_ID) as SENTIMENT_ID,
+    s.COMPLAINT_ID,
     CASE 
-      WHEN SNOWFLAKE.CORTEX.SENTIMENT(c.COMPLAINT_TEXT) > 0.3 THEN 'Positive'
-      WHEN SNOWFLAKE.CORTEX.SENTIMENT(c.COMPLAINT_TEXT) < -0.3 THEN 'Negative'
+      WHEN s.CORTEX_SCORE > 0.3 THEN 'Positive'
+      WHEN s.CORTEX_SCORE < -0.3 THEN 'Negative'
       ELSE 'Neutral'
     END as OVERALL_SENTIMENT,
-    SNOWFLAKE.CORTEX.SENTIMENT(c.COMPLAINT_TEXT) as SENTIMENT_SCORE,
+    s.CORTEX_SCORE as SENTIMENT_SCORE,
     0.85 as CONFIDENCE_LEVEL,
     CURRENT_TIMESTAMP() as ANALYZED_TIMESTAMP,
     'cortex_v1' as MODEL_VERSION,
     CURRENT_TIMESTAMP() as CREATED_DATE
-  FROM COMPLAINTS.UNIFIED_COMPLAINT c
-  WHERE c.COMPLAINT_ID NOT IN (SELECT COMPLAINT_ID FROM SENTIMENT.SENTIMENT_SCORE);
+  FROM (
+    SELECT 
+      b.COMPLAINT_ID,
+      SNOWFLAKE.CORTEX.SENTIMENT(b.COMPLAINT_TEXT) as CORTEX_SCORE
+    FROM SENTIMENT_BATCH b
+    WHERE NOT :use_cascade
+      OR b.LEXICON:confidence::FLOAT < :CONFIDENCE_THRESHOLD
+  ) s;
   
-  rows_inserted := SQLROWCOUNT;
+  cortex_rows := SQLROWCOUNT;
+
+  -- Cost savings: Cortex calls avoided and approximate tokens (~4 chars per token)
+  SELECT COALESCE(SUM(LENGTH(b.COMPLAINT_TEXT)), 0)
+  INTO :chars_avoided
+  FROM SENTIMENT_BATCH b
+  WHERE :use_cascade
+    AND b.LEXICON:confidence::FLOAT >= :CONFIDENCE_THRESHOLD;
+
+  IF (lexicon_rows + cortex_rows > 0) THEN
+    pct_avoided := ROUND(lexicon_rows * 100.0 / (lexicon_rows + cortex_rows), 1);
+  END IF;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+    RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
+  )
+  SELECT
+    UUID_STRING(),
+    'UPDATE_SENTIMENT_SCORES',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :lexicon_rows + :cortex_rows,
+    OBJECT_CONSTRUCT(
+      'mode', LOWER(:RUN_MODE),
+      'confidence_threshold', :CONFIDENCE_THRESHOLD,
+      'lexicon_rows', :lexicon_rows,
+      'cortex_rows', :cortex_rows,
+      'cortex_calls_avoided_pct', :pct_avoided,
+      'estimated_tokens_saved', ROUND(:chars_avoided / 4)
+    );
   
-  RETURN 'Sentiment scores updated: ' || rows_inserted || ' rows inserted';
+  RETURN 'Sentiment scores updated: ' || (lexicon_rows + cortex_rows) || ' rows inserted' ||
+         ' (lexicon_v1: ' || lexicon_rows || ', cortex_v1: ' || cortex_rows ||
+         ' | Cortex calls avoided: ' || pct_avoided || '%, ~' || ROUND(chars_avoided / 4) || ' tokens saved)';
 END;
 $$;
 
@@ -203,17 +341,282 @@ BEGIN
 END;
 $$;
 
+-- Compact per-call sentiment timeline built from customer utterances
+CREATE TABLE IF NOT EXISTS VOICE_CALL_TIMELINE (
+    CALL_ID VARCHAR(50) PRIMARY KEY,
+    COMPLAINT_ID VARCHAR(50),
+    AGENT_ID VARCHAR(50),
+    CALL_TIMESTAMP TIMESTAMP_NTZ,
+    CUSTOMER_TURNS INT, -- 0 marks a processed call with no customer turns
+    START_SENTIMENT FLOAT, -- First customer utterance
+    END_SENTIMENT FLOAT, -- Last customer utterance
+    MIN_SENTIMENT FLOAT,
+    TURNING_POINT_SECONDS INT, -- Offset of the lowest-scoring utterance
+    SENTIMENT_DROP FLOAT, -- START_SENTIMENT - MIN_SENTIMENT
+    TIMELINE VARIANT, -- [{"t": offset_seconds, "s": score}, ...]
+    CREATED_DATE TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Per-call customer sentiment timeline from voice transcripts';
+
+-- Procedure to build voice sentiment timelines for calls not yet processed
+-- Uses TRANSCRIPT_JSON turns when present, otherwise splits TRANSCRIPT_TEXT
+-- ("Speaker: text" lines) and estimates offsets from cumulative text length.
+-- Utterances are scored set-based: lexicon first, Cortex below CONFIDENCE_THRESHOLD
+CREATE OR REPLACE PROCEDURE BUILD_VOICE_SENTIMENT_TIMELINE(CONFIDENCE_THRESHOLD FLOAT DEFAULT 0.6)
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  utterances INT;
+  cortex_calls INT;
+  calls_inserted INT;
+  emotions_updated INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE OR REPLACE TEMPORARY TABLE VOICE_PENDING_CALL AS
+  SELECT vt.CALL_ID, vt.AGENT_ID, vt.CALL_TIMESTAMP, vt.DURATION_SECONDS, vt.TRANSCRIPT_TEXT, vt.TRANSCRIPT_JSON
+  FROM COMPLAINTS.VOICE_TRANSCRIPT vt
+  WHERE vt.CALL_ID NOT IN (SELECT CALL_ID FROM SENTIMENT.VOICE_CALL_TIMELINE);
+
+  CREATE OR REPLACE TEMPORARY TABLE VOICE_UTTERANCE_BATCH AS
+  WITH pending AS (
+    SELECT * FROM VOICE_PENDING_CALL
+  ),
+  json_turns AS (
+    SELECT 
+      p.CALL_ID,
+      t.INDEX as TURN_INDEX,
+      t.value:speaker::VARCHAR as SPEAKER,
+      COALESCE(TRY_TO_DOUBLE(t.value:offset_seconds::VARCHAR),
+               TRY_TO_DOUBLE(t.value:start_time::VARCHAR),
+               TRY_TO_DOUBLE(t.value:timestamp::VARCHAR)) as OFFSET_SECONDS,
+      t.value:text::VARCHAR as UTTERANCE
+    FROM pending p,
+    LATERAL FLATTEN(INPUT => p.TRANSCRIPT_JSON) t
+    WHERE p.TRANSCRIPT_JSON IS NOT NULL
+  ),
+  text_lines AS (
+    SELECT 
+      p.CALL_ID,
+      p.DURATION_SECONDS,
+      l.INDEX as TURN_INDEX,
+      l.VALUE as LINE_TEXT,
+      LENGTH(p.TRANSCRIPT_TEXT) as TOTAL_CHARS
+    FROM pending p,
+    LATERAL SPLIT_TO_TABLE(p.TRANSCRIPT_TEXT, '\n') l
+    WHERE p.TRANSCRIPT_JSON IS NULL
+      AND p.TRANSCRIPT_TEXT IS NOT NULL
+      AND TRIM(l.VALUE) <> ''
+  ),
+  text_turns AS (
+    SELECT 
+      CALL_ID,
+      TURN_INDEX,
+      TRIM(SPLIT_PART(LINE_TEXT, ':', 1)) as SPEAKER,
+      COALESCE(SUM(LENGTH(LINE_TEXT)) OVER (
+        PARTITION BY CALL_ID ORDER BY TURN_INDEX
+        ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+      ), 0) / NULLIF(TOTAL_CHARS, 0) * DURATION_SECONDS as OFFSET_SECONDS,
+      TRIM(SUBSTR(LINE_TEXT, POSITION(':' IN LINE_TEXT) + 1)) as UTTERANCE
+    FROM text_lines
+  ),
+  turns AS (
+    SELECT * FROM json_turns
+    UNION ALL
+    SELECT * FROM text_turns
+  )
+  SELECT 
+    t.CALL_ID,
+    t.TURN_INDEX,
+    ROUND(t.OFFSET_SECONDS)::INT as OFFSET_SECONDS,
+    t.UTTERANCE,
+    SENTIMENT.LEXICON_SENTIMENT(t.UTTERANCE) as LEXICON,
+    LEXICON:score::FLOAT as SENTIMENT_SCORE,
+    'lexicon_v1' as SCORE_SOURCE
+  FROM turns t
+  WHERE LOWER(t.SPEAKER) IN ('customer', 'caller', 'client');
+
+  utterances := (SELECT COUNT(*) FROM VOICE_UTTERANCE_BATCH);
+
+  -- Low-confidence utterances go to Cortex in one set-based statement
+  UPDATE VOICE_UTTERANCE_BATCH
+  SET SENTIMENT_SCORE = SNOWFLAKE.CORTEX.SENTIMENT(UTTERANCE),
+      SCORE_SOURCE = 'cortex_v1'
+  WHERE LEXICON:confidence::FLOAT < :CONFIDENCE_THRESHOLD;
+
+  cortex_calls := SQLROWCOUNT;
+
+  INSERT INTO SENTIMENT.VOICE_CALL_TIMELINE (
+    CALL_ID,
+    COMPLAINT_ID,
+    AGENT_ID,
+    CALL_TIMESTAMP,
+    CUSTOMER_TURNS,
+    START_SENTIMENT,
+    END_SENTIMENT,
+    MIN_SENTIMENT,
+    TURNING_POINT_SECONDS,
+    SENTIMENT_DROP,
+    TIMELINE,
+    CREATED_DATE
+  )
+  SELECT
+    b.CALL_ID,
+    MAX(c.COMPLAINT_ID) as COMPLAINT_ID,
+    MAX(vt.AGENT_ID) as AGENT_ID,
+    MAX(vt.CALL_TIMESTAMP) as CALL_TIMESTAMP,
+    COUNT(*) as CUSTOMER_TURNS,
+    ROUND(MIN_BY(b.SENTIMENT_SCORE, b.TURN_INDEX), 4) as START_SENTIMENT,
+    ROUND(MAX_BY(b.SENTIMENT_SCORE, b.TURN_INDEX), 4) as END_SENTIMENT,
+    ROUND(MIN(b.SENTIMENT_SCORE), 4) as MIN_SENTIMENT,
+    MIN_BY(b.OFFSET_SECONDS, b.SENTIMENT_SCORE) as TURNING_POINT_SECONDS,
+    ROUND(MIN_BY(b.SENTIMENT_SCORE, b.TURN_INDEX) - MIN(b.SENTIMENT_SCORE), 4) as SENTIMENT_DROP,
+    ARRAY_AGG(OBJECT_CONSTRUCT('t', b.OFFSET_SECONDS, 's', ROUND(b.SENTIMENT_SCORE, 2)))
+      WITHIN GROUP (ORDER BY b.TURN_INDEX) as TIMELINE,
+    CURRENT_TIMESTAMP() as CREATED_DATE
+  FROM VOICE_UTTERANCE_BATCH b
+  JOIN COMPLAINTS.VOICE_TRANSCRIPT vt ON vt.CALL_ID = b.CALL_ID
+  LEFT JOIN COMPLAINTS.UNIFIED_COMPLAINT c ON c.SOURCE_ID = b.CALL_ID AND c.CHANNEL = 'Voice'
+  GROUP BY b.CALL_ID;
+
+  calls_inserted := SQLROWCOUNT;
+
+  -- Marker rows for calls without customer turns, so they are not parsed again
+  INSERT INTO SENTIMENT.VOICE_CALL_TIMELINE (CALL_ID, AGENT_ID, CALL_TIMESTAMP, CUSTOMER_TURNS, CREATED_DATE)
+  SELECT p.CALL_ID, p.AGENT_ID, p.CALL_TIMESTAMP, 0, CURRENT_TIMESTAMP()
+  FROM VOICE_PENDING_CALL p
+  WHERE p.CALL_ID NOT IN (SELECT CALL_ID FROM VOICE_UTTERANCE_BATCH);
+
+  -- Fill the voice emotion timeline on existing emotion detections
+  UPDATE SENTIMENT.EMOTION_DETECTION e
+  SET EMOTION_TIMELINE = t.TIMELINE
+  FROM SENTIMENT.VOICE_CALL_TIMELINE t
+  WHERE e.COMPLAINT_ID = t.COMPLAINT_ID
+    AND e.EMOTION_TIMELINE IS NULL;
+
+  emotions_updated := SQLROWCOUNT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+    RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
+  )
+  SELECT
+    UUID_STRING(),
+    'BUILD_VOICE_SENTIMENT_TIMELINE',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :utterances,
+    OBJECT_CONSTRUCT(
+      'calls_processed', :calls_inserted,
+      'cortex_calls', :cortex_calls,
+      'emotion_timelines_filled', :emotions_updated
+    );
+
+  RETURN 'Voice timelines built: ' || calls_inserted || ' calls, ' || utterances || ' customer utterances (' || cortex_calls || ' scored by Cortex)';
+END;
+$$;
+
 -- Procedure to predict churn risk
-CREATE OR REPLACE PROCEDURE PREDICT_CHURN_RISK()
+-- RUN_MODE 'full' re-scores every customer; 'incremental' re-scores only customers
+-- whose CUSTOMER_IMPACT_SCORE changed since the last run (consumes the change stream)
+CREATE OR REPLACE PROCEDURE PREDICT_CHURN_RISK(RUN_MODE VARCHAR DEFAULT 'full')
 RETURNS STRING
 LANGUAGE SQL
 AS
 $$
 DECLARE
-  rows_inserted INT;
+  run_started TIMESTAMP_NTZ;
+  customers_changed INT;
+  rows_merged INT;
+  invalid_run_mode EXCEPTION (-20001, 'Unknown RUN_MODE - expected ''full'' or ''incremental''');
 BEGIN
-  -- Calculate churn risk for customers
-  INSERT INTO SENTIMENT.CHURN_RISK_PREDICTION (
+  IF (LOWER(RUN_MODE) NOT IN ('full', 'incremental')) THEN
+    RAISE invalid_run_mode;
+  END IF;
+
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS CHURN_SCORING_BATCH (
+    CUSTOMER_ID VARCHAR(50)
+  );
+  TRUNCATE TABLE CHURN_SCORING_BATCH;
+
+  BEGIN TRANSACTION;
+
+  -- Drain and MERGE commit together so a failed MERGE leaves the stream offset unmoved
+  IF (LOWER(RUN_MODE) = 'incremental') THEN
+    -- Updates surface as DELETE + INSERT pairs; the INSERT side carries the new values
+    INSERT INTO CHURN_SCORING_BATCH
+    SELECT DISTINCT CUSTOMER_ID
+    FROM INTEGRATION.CUSTOMER_IMPACT_SCORE_CHURN_STREAM
+    WHERE METADATA$ACTION = 'INSERT';
+  ELSE
+    INSERT INTO CHURN_SCORING_BATCH
+    SELECT CUSTOMER_ID FROM INTEGRATION.CUSTOMER_IMPACT_SCORE;
+  END IF;
+
+  customers_changed := SQLROWCOUNT;
+
+  -- Calculate churn risk for the batch and upsert
+  MERGE INTO SENTIMENT.CHURN_RISK_PREDICTION t
+  USING (
+    SELECT
+      'CHR-' || MD5(cis.CUSTOMER_ID) as PREDICTION_ID,
+      cis.CUSTOMER_ID,
+      -- Calculate churn probability based on multiple factors
+      LEAST(100, (
+        (100 - cis.OVERALL_HEALTH_SCORE) * 0.40 +
+        (100 - cis.COMPLAINT_FREQUENCY_SCORE) * 0.30 +
+        (100 - cis.SENTIMENT_TREND_SCORE) * 0.20 +
+        (100 - cis.BILLING_DISPUTE_SCORE) * 0.10
+      )) as CHURN_PROBABILITY,
+      -- Determine risk level
+      CASE
+        WHEN cis.OVERALL_HEALTH_SCORE < 50 OR cis.CHURN_RISK_FLAG = TRUE THEN 'Critical'
+        WHEN cis.OVERALL_HEALTH_SCORE < 65 THEN 'High'
+        WHEN cis.OVERALL_HEALTH_SCORE < 80 THEN 'Medium'
+        ELSE 'Low'
+      END as RISK_LEVEL,
+      -- Build risk factors JSON
+      OBJECT_CONSTRUCT(
+        'health_score', cis.OVERALL_HEALTH_SCORE,
+        'complaint_frequency', cis.COMPLAINT_FREQUENCY_SCORE,
+        'sentiment_trend', cis.SENTIMENT_TREND_SCORE,
+        'billing_disputes', cis.BILLING_DISPUTE_SCORE,
+        'payment_behavior', cis.PAYMENT_BEHAVIOR_SCORE
+      ) as RISK_FACTORS,
+      CURRENT_DATE() as PREDICTION_DATE,
+      'rule_based_v1' as MODEL_VERSION,
+      -- Recommended actions
+      CASE
+        WHEN cis.OVERALL_HEALTH_SCORE < 50 THEN 'Immediate intervention: Assign retention specialist, offer service credit'
+        WHEN cis.OVERALL_HEALTH_SCORE < 65 THEN 'High priority: Contact customer within 24h, review service quality'
+        WHEN cis.OVERALL_HEALTH_SCORE < 80 THEN 'Monitor closely: Schedule proactive check-in call'
+        ELSE 'Standard monitoring: Continue regular customer service'
+      END as RECOMMENDED_ACTION,
+      -- Priority for intervention
+      CASE
+        WHEN cis.OVERALL_HEALTH_SCORE < 50 THEN 1
+        WHEN cis.OVERALL_HEALTH_SCORE < 65 THEN 2
+        WHEN cis.OVERALL_HEALTH_SCORE < 80 THEN 3
+        ELSE 4
+      END as INTERVENTION_PRIORITY,
+      CURRENT_TIMESTAMP() as CREATED_DATE
+    FROM INTEGRATION.CUSTOMER_IMPACT_SCORE cis
+    JOIN CHURN_SCORING_BATCH b ON b.CUSTOMER_ID = cis.CUSTOMER_ID
+  ) s
+  ON t.CUSTOMER_ID = s.CUSTOMER_ID
+  WHEN MATCHED THEN UPDATE SET
+    CHURN_PROBABILITY = s.CHURN_PROBABILITY,
+    RISK_LEVEL = s.RISK_LEVEL,
+    RISK_FACTORS = s.RISK_FACTORS,
+    PREDICTION_DATE = s.PREDICTION_DATE,
+    MODEL_VERSION = s.MODEL_VERSION,
+    RECOMMENDED_ACTION = s.RECOMMENDED_ACTION,
+    INTERVENTION_PRIORITY = s.INTERVENTION_PRIORITY
+  WHEN NOT MATCHED THEN INSERT (
     PREDICTION_ID,
     CUSTOMER_ID,
     CHURN_PROBABILITY,
@@ -224,55 +627,39 @@ BEGIN
     RECOMMENDED_ACTION,
     INTERVENTION_PRIORITY,
     CREATED_DATE
+  ) VALUES (
+    s.PREDICTION_ID,
+    s.CUSTOMER_ID,
+    s.CHURN_PROBABILITY,
+    s.RISK_LEVEL,
+    s.RISK_FACTORS,
+    s.PREDICTION_DATE,
+    s.MODEL_VERSION,
+    s.RECOMMENDED_ACTION,
+    s.INTERVENTION_PRIORITY,
+    s.CREATED_DATE
+  );
+  
+  rows_merged := SQLROWCOUNT;
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+    RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
   )
   SELECT
-    'CHR-' || MD5(cis.CUSTOMER_ID) as PREDICTION_ID,
-    cis.CUSTOMER_ID,
-    -- Calculate churn probability based on multiple factors
-    LEAST(100, (
-      (100 - cis.OVERALL_HEALTH_SCORE) * 0.40 +
-      (100 - cis.COMPLAINT_FREQUENCY_SCORE) * 0.30 +
-      (100 - cis.SENTIMENT_TREND_SCORE) * 0.20 +
-      (100 - cis.BILLING_DISPUTE_SCORE) * 0.10
-    )) as CHURN_PROBABILITY,
-    -- Determine risk level
-    CASE
-      WHEN cis.OVERALL_HEALTH_SCORE < 50 OR cis.CHURN_RISK_FLAG = TRUE THEN 'Critical'
-      WHEN cis.OVERALL_HEALTH_SCORE < 65 THEN 'High'
-      WHEN cis.OVERALL_HEALTH_SCORE < 80 THEN 'Medium'
-      ELSE 'Low'
-    END as RISK_LEVEL,
-    -- Build risk factors JSON
+    UUID_STRING(),
+    'PREDICT_CHURN_RISK',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :customers_changed,
     OBJECT_CONSTRUCT(
-      'health_score', cis.OVERALL_HEALTH_SCORE,
-      'complaint_frequency', cis.COMPLAINT_FREQUENCY_SCORE,
-      'sentiment_trend', cis.SENTIMENT_TREND_SCORE,
-      'billing_disputes', cis.BILLING_DISPUTE_SCORE,
-      'payment_behavior', cis.PAYMENT_BEHAVIOR_SCORE
-    ) as RISK_FACTORS,
-    CURRENT_DATE() as PREDICTION_DATE,
-    'rule_based_v1' as MODEL_VERSION,
-    -- Recommended actions
-    CASE
-      WHEN cis.OVERALL_HEALTH_SCORE < 50 THEN 'Immediate intervention: Assign retention specialist, offer service credit'
-      WHEN cis.OVERALL_HEALTH_SCORE < 65 THEN 'High priority: Contact customer within 24h, review service quality'
-      WHEN cis.OVERALL_HEALTH_SCORE < 80 THEN 'Monitor closely: Schedule proactive check-in call'
-      ELSE 'Standard monitoring: Continue regular customer service'
-    END as RECOMMENDED_ACTION,
-    -- Priority for intervention
-    CASE
-      WHEN cis.OVERALL_HEALTH_SCORE < 50 THEN 1
-      WHEN cis.OVERALL_HEALTH_SCORE < 65 THEN 2
-      WHEN cis.OVERALL_HEALTH_SCORE < 80 THEN 3
-      ELSE 4
-    END as INTERVENTION_PRIORITY,
-    CURRENT_TIMESTAMP() as CREATED_DATE
-  FROM INTEGRATION.CUSTOMER_IMPACT_SCORE cis
-  WHERE cis.CUSTOMER_ID NOT IN (SELECT CUSTOMER_ID FROM SENTIMENT.CHURN_RISK_PREDICTION);
+      'run_mode', LOWER(:RUN_MODE),
+      'rows_merged', :rows_merged
+    );
   
-  rows_inserted := SQLROWCOUNT;
-  
-  RETURN 'Churn risk predictions created: ' || rows_inserted || ' rows inserted';
+  RETURN 'Churn risk predictions refreshed (' || RUN_MODE || '): ' || customers_changed || ' customers scored, ' || rows_merged || ' rows merged';
 END;
 $$;
 
@@ -345,14 +732,188 @@ BEGIN
 END;
 $$;
 
+-- Per-customer rolling counters maintained by the streaming alert evaluator
+CREATE TABLE IF NOT EXISTS CUSTOMER_ALERT_STATE (
+    CUSTOMER_ID VARCHAR(50) PRIMARY KEY,
+    TOTAL_COMPLAINTS INT NOT NULL,
+    WINDOW_START TIMESTAMP_NTZ NOT NULL, -- Earliest complaint in the trailing 7 days
+    WINDOW_COMPLAINTS INT NOT NULL, -- Complaints in the 7 days up to LAST_COMPLAINT_TIMESTAMP
+    LAST_COMPLAINT_TIMESTAMP TIMESTAMP_NTZ,
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Rolling complaint counters per customer for streaming alerts';
+
+-- Procedure to evaluate alerts for complaints arriving on the alert stream
+-- Same rules as CREATE_CRITICAL_ALERTS, but reads only new rows and uses the
+-- trailing 7-day counter instead of a COUNT(*) over the full complaint history
+-- to label repeat complainers (the counter only picks the alert type)
+CREATE OR REPLACE PROCEDURE EVALUATE_STREAMING_ALERTS()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  new_complaints INT;
+  rows_inserted INT;
+  max_latency_seconds INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS ALERT_STREAM_BATCH (
+    COMPLAINT_ID VARCHAR(50),
+    CUSTOMER_ID VARCHAR(50),
+    CHANNEL VARCHAR(20),
+    SOURCE_ID VARCHAR(50),
+    PRIORITY VARCHAR(20),
+    COMPLAINT_TIMESTAMP TIMESTAMP_NTZ,
+    CREATED_DATE TIMESTAMP_NTZ
+  );
+  TRUNCATE TABLE ALERT_STREAM_BATCH;
+
+  BEGIN TRANSACTION;
+
+  -- Consume the stream once; the offset advances on COMMIT
+  INSERT INTO ALERT_STREAM_BATCH
+  SELECT COMPLAINT_ID, CUSTOMER_ID, CHANNEL, SOURCE_ID, PRIORITY, COMPLAINT_TIMESTAMP, CREATED_DATE
+  FROM COMPLAINTS.UNIFIED_COMPLAINT_ALERT_STREAM
+  WHERE METADATA$ACTION = 'INSERT';
+
+  new_complaints := SQLROWCOUNT;
+
+  -- Recompute the trailing 7-day window for the customers in this batch only
+  -- (anchored at each customer's latest complaint, as in the history seed)
+  MERGE INTO SENTIMENT.CUSTOMER_ALERT_STATE t
+  USING (
+    WITH batch AS (
+      SELECT 
+        CUSTOMER_ID,
+        COUNT(*) as NEW_COMPLAINTS,
+        MAX(COMPLAINT_TIMESTAMP) as LAST_TS
+      FROM ALERT_STREAM_BATCH
+      GROUP BY CUSTOMER_ID
+    ),
+    anchored AS (
+      SELECT 
+        b.CUSTOMER_ID,
+        b.NEW_COMPLAINTS,
+        GREATEST(b.LAST_TS, COALESCE(st.LAST_COMPLAINT_TIMESTAMP, b.LAST_TS)) as LAST_TS
+      FROM batch b
+      LEFT JOIN SENTIMENT.CUSTOMER_ALERT_STATE st ON st.CUSTOMER_ID = b.CUSTOMER_ID
+    )
+    SELECT 
+      an.CUSTOMER_ID,
+      an.NEW_COMPLAINTS,
+      an.LAST_TS,
+      MIN(c.COMPLAINT_TIMESTAMP) as WINDOW_START,
+      COUNT(*) as WINDOW_COMPLAINTS
+    FROM anchored an
+    JOIN COMPLAINTS.UNIFIED_COMPLAINT c
+      ON c.CUSTOMER_ID = an.CUSTOMER_ID
+      AND c.COMPLAINT_TIMESTAMP > DATEADD(day, -7, an.LAST_TS)
+      AND c.COMPLAINT_TIMESTAMP <= an.LAST_TS
+    GROUP BY an.CUSTOMER_ID, an.NEW_COMPLAINTS, an.LAST_TS
+  ) s
+  ON t.CUSTOMER_ID = s.CUSTOMER_ID
+  WHEN MATCHED THEN UPDATE SET
+    TOTAL_COMPLAINTS = t.TOTAL_COMPLAINTS + s.NEW_COMPLAINTS,
+    WINDOW_START = s.WINDOW_START,
+    WINDOW_COMPLAINTS = s.WINDOW_COMPLAINTS,
+    LAST_COMPLAINT_TIMESTAMP = s.LAST_TS,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (
+    CUSTOMER_ID, TOTAL_COMPLAINTS, WINDOW_START, WINDOW_COMPLAINTS, LAST_COMPLAINT_TIMESTAMP, UPDATED_AT
+  ) VALUES (
+    s.CUSTOMER_ID, s.NEW_COMPLAINTS, s.WINDOW_START, s.WINDOW_COMPLAINTS, s.LAST_TS, CURRENT_TIMESTAMP()
+  );
+
+  -- Emit alerts for the new complaints only
+  INSERT INTO SENTIMENT.ALERT_TRIGGER (
+    ALERT_ID,
+    COMPLAINT_ID,
+    CUSTOMER_ID,
+    ALERT_TYPE,
+    SEVERITY,
+    ALERT_REASON,
+    TRIGGERED_TIMESTAMP,
+    ASSIGNED_TO,
+    STATUS,
+    CREATED_DATE
+  )
+  SELECT
+    'ALT-' || MD5(b.COMPLAINT_ID) as ALERT_ID,
+    b.COMPLAINT_ID,
+    b.CUSTOMER_ID,
+    CASE
+      WHEN crp.RISK_LEVEL = 'Critical' THEN 'High_Churn_Risk'
+      WHEN sp.INFLUENCER_FLAG = TRUE THEN 'Viral_Social'
+      WHEN a.TIER = 'Gold' THEN 'VIP_Customer'
+      WHEN st.WINDOW_COMPLAINTS > 3 THEN 'Repeated_Issue'
+      ELSE 'Critical_Complaint'
+    END as ALERT_TYPE,
+    CASE
+      WHEN crp.RISK_LEVEL = 'Critical' OR sp.INFLUENCER_FLAG = TRUE THEN 'Critical'
+      WHEN a.TIER = 'Gold' OR crp.RISK_LEVEL = 'High' THEN 'High'
+      ELSE 'Medium'
+    END as SEVERITY,
+    'Customer ' || b.CUSTOMER_ID || ' requires immediate attention: ' ||
+    CASE
+      WHEN crp.RISK_LEVEL = 'Critical' THEN 'High churn risk detected'
+      WHEN sp.INFLUENCER_FLAG = TRUE THEN 'Public social media complaint from influencer'
+      WHEN a.TIER = 'Gold' THEN 'VIP customer complaint'
+      ELSE 'Multiple complaints in short period'
+    END as ALERT_REASON,
+    CURRENT_TIMESTAMP() as TRIGGERED_TIMESTAMP,
+    'SYSTEM_ASSIGN' as ASSIGNED_TO,
+    'New' as STATUS,
+    CURRENT_TIMESTAMP() as CREATED_DATE
+  FROM ALERT_STREAM_BATCH b
+  JOIN CUSTOMER_DATA.ACCOUNT a ON a.ACCOUNT_ID = b.CUSTOMER_ID
+  JOIN SENTIMENT.CUSTOMER_ALERT_STATE st ON st.CUSTOMER_ID = b.CUSTOMER_ID
+  LEFT JOIN SENTIMENT.CHURN_RISK_PREDICTION crp ON crp.CUSTOMER_ID = b.CUSTOMER_ID
+  LEFT JOIN COMPLAINTS.SOCIAL_MEDIA_POST sp ON sp.POST_ID = b.SOURCE_ID AND b.CHANNEL = 'Social'
+  WHERE 
+    (crp.RISK_LEVEL IN ('Critical', 'High') 
+     OR sp.INFLUENCER_FLAG = TRUE 
+     OR a.TIER = 'Gold'
+     OR b.PRIORITY = 'Critical')
+    AND NOT EXISTS (SELECT 1 FROM SENTIMENT.ALERT_TRIGGER x WHERE x.COMPLAINT_ID = b.COMPLAINT_ID);
+
+  rows_inserted := SQLROWCOUNT;
+
+  COMMIT;
+
+  SELECT COALESCE(MAX(DATEDIFF(second, CREATED_DATE, CURRENT_TIMESTAMP())), 0)
+  INTO :max_latency_seconds
+  FROM ALERT_STREAM_BATCH;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+    RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
+  )
+  SELECT
+    UUID_STRING(),
+    'EVALUATE_STREAMING_ALERTS',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :new_complaints,
+    OBJECT_CONSTRUCT(
+      'alerts_created', :rows_inserted,
+      'max_ingestion_to_alert_seconds', :max_latency_seconds
+    );
+
+  RETURN 'Streaming alerts: ' || new_complaints || ' new complaints evaluated, ' || rows_inserted || ' alerts created';
+END;
+$$;
+
 -- =====================================================================
 -- SECTION 2: EXECUTE AI ANALYSIS
 -- =====================================================================
 
 SELECT 'Executing AI analysis procedures...' as STATUS;
 
--- Run sentiment analysis
-CALL UPDATE_SENTIMENT_SCORES();
+-- Run sentiment analysis (cascade: lexicon first, Cortex only for low-confidence texts)
+-- Use CALL UPDATE_SENTIMENT_SCORES(); to send every complaint to Cortex
+CALL UPDATE_SENTIMENT_SCORES('cascade', 0.6);
 
 -- Classify topics
 CALL CLASSIFY_COMPLAINT_TOPICS();
@@ -360,6 +921,9 @@ CALL CLASSIFY_COMPLAINT_TOPICS();
 -- Detect emotions
 CALL DETECT_EMOTIONS();
 
+-- Build voice call sentiment timelines (fills EMOTION_TIMELINE)
+CALL BUILD_VOICE_SENTIMENT_TIMELINE();
+
 -- Predict churn risk
 CALL PREDICT_CHURN_RISK();
 
@@ -382,6 +946,16 @@ FROM SENTIMENT.SENTIMENT_SCORE
 GROUP BY OVERALL_SENTIMENT
 ORDER BY COUNT DESC;
 
+-- Check which tier scored each row
+SELECT 
+    'Sentiment Model Tiers' as METRIC,
+    MODEL_VERSION,
+    COUNT(*) as COUNT,
+    ROUND(AVG(CONFIDENCE_LEVEL), 2) as AVG_CONFIDENCE
+FROM SENTIMENT.SENTIMENT_SCORE
+GROUP BY MODEL_VERSION
+ORDER BY COUNT DESC;
+
 -- Check emotion distribution
 SELECT 
     'Emotion Distribution' as METRIC,
@@ -419,15 +993,24 @@ GROUP BY ALERT_TYPE, SEVERITY
 ORDER BY COUNT DESC;
 
 -- =====================================================================
--- SECTION 4: CREATE HELPER VIEWS
+-- SECTION 4: CREATE HELPER VIEWS (DYNAMIC TABLES)
 -- =====================================================================
 
 USE SCHEMA ANALYTICS;
 
-SELECT 'Creating analytics helper views...' as STATUS;
+SELECT 'Creating analytics helper dynamic tables...' as STATUS;
+
+-- Earlier versions created these as plain views; a dynamic table cannot replace a view
+DROP VIEW IF EXISTS V_SENTIMENT_BY_CHANNEL;
+DROP VIEW IF EXISTS V_HIGH_RISK_CUSTOMERS;
 
--- Sentiment trend by channel
-CREATE OR REPLACE VIEW V_SENTIMENT_BY_CHANNEL AS
+-- Sentiment trend by channel (incremental refresh: only new scores are aggregated)
+CREATE OR REPLACE DYNAMIC TABLE V_SENTIMENT_BY_CHANNEL
+    TARGET_LAG = '5 minutes'
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = INCREMENTAL
+    COMMENT = 'Sentiment distribution per channel, maintained incrementally'
+AS
 SELECT
     c.CHANNEL,
     COUNT(*) as TOTAL_COMPLAINTS,
@@ -438,11 +1021,45 @@ SELECT
     ROUND(SUM(CASE WHEN s.OVERALL_SENTIMENT = 'Negative' THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) as NEGATIVE_PERCENTAGE
 FROM COMPLAINTS.UNIFIED_COMPLAINT c
 JOIN SENTIMENT.SENTIMENT_SCORE s ON s.COMPLAINT_ID = c.COMPLAINT_ID
-GROUP BY c.CHANNEL
-ORDER BY NEGATIVE_PERCENTAGE DESC;
+GROUP BY c.CHANNEL;
+
+-- Daily sentiment rollup by channel x category x region x tier
+-- Complaints LEFT JOIN scores so unscored days still carry volume; the score sum
+-- (not an average) is stored so rollups can be re-aggregated over any date range
+CREATE OR REPLACE DYNAMIC TABLE DAILY_SENTIMENT_ROLLUP
+    TARGET_LAG = '15 minutes'
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = INCREMENTAL
+    COMMENT = 'Daily complaint and Cortex sentiment rollup for dashboards'
+AS
+SELECT
+    DATE(c.COMPLAINT_TIMESTAMP) as COMPLAINT_DATE,
+    c.CHANNEL,
+    COALESCE(c.CATEGORY, 'Unknown') as CATEGORY,
+    COALESCE(a.REGION, 'Unknown') as REGION,
+    COALESCE(a.TIER, 'Unknown') as TIER,
+    COUNT(*) as COMPLAINT_COUNT,
+    COUNT(s.COMPLAINT_ID) as SCORED_COUNT,
+    SUM(CASE WHEN s.OVERALL_SENTIMENT = 'Positive' THEN 1 ELSE 0 END) as POSITIVE_COUNT,
+    SUM(CASE WHEN s.OVERALL_SENTIMENT = 'Neutral' THEN 1 ELSE 0 END) as NEUTRAL_COUNT,
+    SUM(CASE WHEN s.OVERALL_SENTIMENT = 'Negative' THEN 1 ELSE 0 END) as NEGATIVE_COUNT,
+    SUM(s.SENTIMENT_SCORE) as SENTIMENT_SCORE_SUM
+FROM COMPLAINTS.UNIFIED_COMPLAINT c
+LEFT JOIN SENTIMENT.SENTIMENT_SCORE s ON s.COMPLAINT_ID = c.COMPLAINT_ID
+LEFT JOIN CUSTOMER_DATA.ACCOUNT a ON a.ACCOUNT_ID = c.CUSTOMER_ID
+GROUP BY 
+    DATE(c.COMPLAINT_TIMESTAMP), c.CHANNEL, COALESCE(c.CATEGORY, 'Unknown'),
+    COALESCE(a.REGION, 'Unknown'), COALESCE(a.TIER, 'Unknown');
 
 -- High risk customers
-CREATE OR REPLACE VIEW V_HIGH_RISK_CUSTOMERS AS
+-- The rolling 3-month complaint window uses CURRENT_DATE(), so Snowflake picks the
+-- refresh mode (AUTO); either way readers hit a precomputed table, not a five-way join
+CREATE OR REPLACE DYNAMIC TABLE V_HIGH_RISK_CUSTOMERS
+    TARGET_LAG = '1 hour'
+    WAREHOUSE = COMPUTE_WH
+    REFRESH_MODE = AUTO
+    COMMENT = 'Critical/High churn risk customers with recent complaint sentiment'
+AS
 SELECT
     a.ACCOUNT_ID,
     a.ACCOUNT_NAME,
@@ -470,11 +1087,78 @@ GROUP BY
     a.ACCOUNT_ID, a.ACCOUNT_NAME, a.ACCOUNT_TYPE, a.TIER, a.REGION,
     crp.CHURN_PROBABILITY, crp.RISK_LEVEL, crp.RECOMMENDED_ACTION,
     cis.OVERALL_HEALTH_SCORE, cis.COMPLAINT_FREQUENCY_SCORE, cis.BILLING_DISPUTE_SCORE,
-    crp.PREDICTION_DATE
-ORDER BY crp.CHURN_PROBABILITY DESC;
+    crp.PREDICTION_DATE;
+
+-- =====================================================================
+-- SECTION 5: STREAMING PIPELINES (STREAMS & TASKS)
+-- =====================================================================
+
+SELECT 'Creating streaming pipelines...' as STATUS;
+
+-- Near-real-time alerts: new complaints -> rolling counters -> ALERT_TRIGGER
+CREATE OR REPLACE STREAM COMPLAINTS.UNIFIED_COMPLAINT_ALERT_STREAM
+    ON TABLE COMPLAINTS.UNIFIED_COMPLAINT
+    APPEND_ONLY = TRUE
+    COMMENT = 'New complaints pending streaming alert evaluation';
+
+-- Seed rolling counters from history (one-off; the task keeps them current)
+MERGE INTO SENTIMENT.CUSTOMER_ALERT_STATE t
+USING (
+    SELECT 
+        c.CUSTOMER_ID,
+        COUNT(*) as TOTAL_COMPLAINTS,
+        MIN(CASE WHEN c.COMPLAINT_TIMESTAMP > DATEADD(day, -7, l.LAST_TS) THEN c.COMPLAINT_TIMESTAMP END) as WINDOW_START,
+        SUM(CASE WHEN c.COMPLAINT_TIMESTAMP > DATEADD(day, -7, l.LAST_TS) THEN 1 ELSE 0 END) as WINDOW_COMPLAINTS,
+        MAX(c.COMPLAINT_TIMESTAMP) as LAST_COMPLAINT_TIMESTAMP
+    FROM COMPLAINTS.UNIFIED_COMPLAINT c
+    JOIN (
+        SELECT CUSTOMER_ID, MAX(COMPLAINT_TIMESTAMP) as LAST_TS
+        FROM COMPLAINTS.UNIFIED_COMPLAINT
+        GROUP BY CUSTOMER_ID
+    ) l ON l.CUSTOMER_ID = c.CUSTOMER_ID
+    GROUP BY c.CUSTOMER_ID
+) s
+ON t.CUSTOMER_ID = s.CUSTOMER_ID
+WHEN MATCHED THEN UPDATE SET
+    TOTAL_COMPLAINTS = s.TOTAL_COMPLAINTS,
+    WINDOW_START = s.WINDOW_START,
+    WINDOW_COMPLAINTS = s.WINDOW_COMPLAINTS,
+    LAST_COMPLAINT_TIMESTAMP = s.LAST_COMPLAINT_TIMESTAMP,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+WHEN NOT MATCHED THEN INSERT (
+    CUSTOMER_ID, TOTAL_COMPLAINTS, WINDOW_START, WINDOW_COMPLAINTS, LAST_COMPLAINT_TIMESTAMP, UPDATED_AT
+) VALUES (
+    s.CUSTOMER_ID, s.TOTAL_COMPLAINTS, s.WINDOW_START, s.WINDOW_COMPLAINTS, s.LAST_COMPLAINT_TIMESTAMP, CURRENT_TIMESTAMP()
+);
+
+-- Evaluate new complaints every minute (skipped when the stream is empty)
+CREATE OR REPLACE TASK SENTIMENT.STREAMING_ALERT_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '1 MINUTE'
+    COMMENT = 'Near-real-time alert generation from new complaints'
+    WHEN SYSTEM$STREAM_HAS_DATA('COMPLAINTS.UNIFIED_COMPLAINT_ALERT_STREAM')
+AS
+    CALL SENTIMENT.EVALUATE_STREAMING_ALERTS();
+
+ALTER TASK SENTIMENT.STREAMING_ALERT_TASK RESUME;
+
+-- Churn scoring: re-score only customers whose impact score changed
+CREATE OR REPLACE STREAM INTEGRATION.CUSTOMER_IMPACT_SCORE_CHURN_STREAM
+    ON TABLE INTEGRATION.CUSTOMER_IMPACT_SCORE
+    COMMENT = 'Customer impact score changes pending churn re-scoring';
+
+CREATE OR REPLACE TASK SENTIMENT.CHURN_REFRESH_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = 'USING CRON 0 2 * * * UTC'
+    COMMENT = 'Daily incremental churn re-scoring from CUSTOMER_IMPACT_SCORE changes'
+    WHEN SYSTEM$STREAM_HAS_DATA('INTEGRATION.CUSTOMER_IMPACT_SCORE_CHURN_STREAM')
+AS
+    CALL SENTIMENT.PREDICT_CHURN_RISK('incremental');
+
+ALTER TASK SENTIMENT.CHURN_REFRESH_TASK RESUME;
 
 -- =====================================================================
--- SECTION 5: SUMMARY
+-- SECTION 6: SUMMARY
 -- =====================================================================
 
 SELECT '==========================================================' as MESSAGE
@@ -490,7 +1174,11 @@ UNION ALL SELECT '  - Emotion Detections: ' || (SELECT COUNT(*) FROM SENTIMENT.E
 UNION ALL SELECT ''
 UNION ALL SELECT 'Predictive Models:'
 UNION ALL SELECT '  - Churn Risk Predictions: ' || (SELECT COUNT(*) FROM SENTIMENT.CHURN_RISK_PREDICTION)
+UNION ALL SELECT '  - Voice Call Timelines: ' || (SELECT COUNT(*) FROM SENTIMENT.VOICE_CALL_TIMELINE)
 UNION ALL SELECT '  - Critical Alerts: ' || (SELECT COUNT(*) FROM SENTIMENT.ALERT_TRIGGER)
+UNION ALL SELECT '  - Streaming Alert Task: STREAMING_ALERT_TASK (every 1 minute)'
+UNION ALL SELECT '  - Daily Sentiment Rollup Rows: ' || (SELECT COUNT(*) FROM ANALYTICS.DAILY_SENTIMENT_ROLLUP)
+UNION ALL SELECT '  - Churn Refresh Task: CHURN_REFRESH_TASK (daily, changed customers only)'
 UNION ALL SELECT ''
 UNION ALL SELECT 'Churn Risk Summary:'
 UNION ALL SELECT '  - Critical Risk: ' || (SELECT COUNT(*) FROM SENTIMENT.CHURN_RISK_PREDICTION WHERE RISK_LEVEL = 'Critical')
@@ -0,0 +1,687 @@
+-- =====================================================================
+-- UC3 - Customer Complaints & Sentiment Analysis
+-- Text Indexes: Near-Duplicate Clustering, Semantic & Keyword Search
+-- =====================================================================
+-- Purpose: Index complaint text for storm detection, similarity and keyword search
+-- Prerequisite: Run create_sentiment_models.sql first
+-- Execution: Run in Snowflake UI (Worksheets) with "Run All"
+-- Time: ~2-5 minutes
+-- =====================================================================
+
+USE ROLE SYSADMIN;
+USE WAREHOUSE COMPUTE_WH;
+USE DATABASE UC3_CUSTOMER_COMPLAINTS;
+
+-- =====================================================================
+-- SECTION 1: NEAR-DUPLICATE INDEX TABLES (MINHASH / LSH)
+-- =====================================================================
+
+USE SCHEMA ANALYTICS;
+
+SELECT 'Creating near-duplicate index tables...' as STATUS;
+
+-- One MinHash signature (64 hashes over word bigrams) per complaint
+CREATE TABLE IF NOT EXISTS COMPLAINT_MINHASH (
+    COMPLAINT_ID VARCHAR(50) PRIMARY KEY,
+    CHANNEL VARCHAR(20),
+    COMPLAINT_TIMESTAMP TIMESTAMP_NTZ,
+    SIGNATURE VARIANT, -- MINHASH(64, shingle) state
+    CLUSTER_ID VARCHAR(50),
+    CREATED_DATE TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'MinHash signatures and cluster assignment per complaint';
+
+-- LSH buckets: 16 bands x 4 rows; complaints sharing a bucket are candidates
+-- (roughly 50% Jaccard similarity gives a 50% chance of sharing at least one band)
+CREATE TABLE IF NOT EXISTS COMPLAINT_LSH_BUCKET (
+    BAND_ID INT NOT NULL,
+    BUCKET_HASH NUMBER(19,0) NOT NULL,
+    COMPLAINT_ID VARCHAR(50) NOT NULL,
+    COMPLAINT_TIMESTAMP TIMESTAMP_NTZ,
+    CLUSTER_ID VARCHAR(50)
+)
+CLUSTER BY (BAND_ID, BUCKET_HASH)
+COMMENT = 'LSH band buckets for near-duplicate candidate lookup';
+
+-- Cluster summary read by the Network Operations dashboard
+CREATE TABLE IF NOT EXISTS COMPLAINT_CLUSTER (
+    CLUSTER_ID VARCHAR(50) PRIMARY KEY,
+    REPRESENTATIVE_COMPLAINT_ID VARCHAR(50), -- Earliest complaint in the cluster
+    REPRESENTATIVE_TEXT VARCHAR(500),
+    TOP_CATEGORY VARCHAR(100),
+    MEMBER_COUNT INT,
+    CHANNEL_COUNT INT,
+    CHANNELS VARCHAR(200),
+    FIRST_SEEN TIMESTAMP_NTZ,
+    LAST_SEEN TIMESTAMP_NTZ,
+    UPDATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Near-duplicate complaint clusters (complaint storms)';
+
+-- =====================================================================
+-- SECTION 2: CLUSTERING PROCEDURE
+-- =====================================================================
+
+SELECT 'Creating clustering procedure...' as STATUS;
+
+-- Procedure to sign new complaints and assign them to near-duplicate clusters
+-- Texts are shingled into word bigrams (a single-word text uses its unigram).
+-- Complaints in a batch that share an LSH bucket inside MATCH_WINDOW_HOURS are
+-- grouped into connected components; a component joins the cluster of the
+-- earliest existing complaint any member matches, otherwise it starts a new
+-- cluster seeded by its earliest member
+CREATE OR REPLACE PROCEDURE UPDATE_COMPLAINT_CLUSTERS(MATCH_WINDOW_HOURS INT DEFAULT 72)
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  new_complaints INT;
+  signed_complaints INT;
+  joined_existing INT;
+  clusters_updated INT;
+  labels_changed INT DEFAULT 1;
+  label_passes INT DEFAULT 0;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS LSH_COMPLAINT_BATCH (
+    COMPLAINT_ID VARCHAR(50),
+    CHANNEL VARCHAR(20),
+    COMPLAINT_TIMESTAMP TIMESTAMP_NTZ,
+    COMPLAINT_TEXT TEXT
+  );
+  TRUNCATE TABLE LSH_COMPLAINT_BATCH;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS LSH_SIGNATURE_BATCH (
+    COMPLAINT_ID VARCHAR(50),
+    SIGNATURE VARIANT
+  );
+  TRUNCATE TABLE LSH_SIGNATURE_BATCH;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS LSH_BUCKET_BATCH (
+    BAND_ID INT,
+    BUCKET_HASH NUMBER(19,0),
+    COMPLAINT_ID VARCHAR(50),
+    COMPLAINT_TIMESTAMP TIMESTAMP_NTZ
+  );
+  TRUNCATE TABLE LSH_BUCKET_BATCH;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS LSH_BATCH_EDGE (
+    SRC_ID VARCHAR(50),
+    DST_ID VARCHAR(50)
+  );
+  TRUNCATE TABLE LSH_BATCH_EDGE;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS LSH_COMPONENT (
+    COMPLAINT_ID VARCHAR(50),
+    COMPONENT_ID VARCHAR(50)
+  );
+  TRUNCATE TABLE LSH_COMPONENT;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS LSH_ASSIGNMENT (
+    COMPLAINT_ID VARCHAR(50),
+    CLUSTER_ID VARCHAR(50),
+    JOINED_EXISTING BOOLEAN
+  );
+  TRUNCATE TABLE LSH_ASSIGNMENT;
+
+  BEGIN TRANSACTION;
+
+  -- Consume the stream (initial run includes all existing complaints); everything up to
+  -- the cluster MERGE commits together so a failure leaves the stream offset unmoved
+  INSERT INTO LSH_COMPLAINT_BATCH
+  SELECT COMPLAINT_ID, CHANNEL, COMPLAINT_TIMESTAMP, COMPLAINT_TEXT
+  FROM COMPLAINTS.UNIFIED_COMPLAINT_LSH_STREAM
+  WHERE METADATA$ACTION = 'INSERT';
+
+  new_complaints := SQLROWCOUNT;
+
+  -- Word-bigram shingles -> 64-hash MinHash signature
+  INSERT INTO LSH_SIGNATURE_BATCH
+  WITH words AS (
+    SELECT
+      b.COMPLAINT_ID,
+      w.INDEX as WORD_INDEX,
+      w.VALUE as WORD
+    FROM LSH_COMPLAINT_BATCH b,
+    LATERAL SPLIT_TO_TABLE(TRIM(REGEXP_REPLACE(LOWER(b.COMPLAINT_TEXT), '[^a-z0-9]+', ' ')), ' ') w
+    WHERE b.COMPLAINT_TEXT IS NOT NULL
+      AND w.VALUE <> ''
+  ),
+  shingles AS (
+    SELECT
+      COMPLAINT_ID,
+      IFF(COUNT(*) OVER (PARTITION BY COMPLAINT_ID) = 1,
+          WORD, -- Single-word texts have no bigram; fall back to the unigram
+          WORD || ' ' || LEAD(WORD) OVER (PARTITION BY COMPLAINT_ID ORDER BY WORD_INDEX)) as SHINGLE
+    FROM words
+  )
+  SELECT
+    s.COMPLAINT_ID,
+    MINHASH(64, s.SHINGLE) as SIGNATURE
+  FROM shingles s
+  WHERE s.SHINGLE IS NOT NULL
+  GROUP BY s.COMPLAINT_ID;
+
+  signed_complaints := (SELECT COUNT(*) FROM LSH_SIGNATURE_BATCH);
+
+  -- Band each signature into 16 buckets of 4 hashes
+  INSERT INTO LSH_BUCKET_BATCH
+  SELECT
+    bands.BAND_ID,
+    HASH(ARRAY_SLICE(s.SIGNATURE:state, bands.BAND_ID * 4, bands.BAND_ID * 4 + 4)) as BUCKET_HASH,
+    s.COMPLAINT_ID,
+    b.COMPLAINT_TIMESTAMP
+  FROM LSH_SIGNATURE_BATCH s
+  JOIN LSH_COMPLAINT_BATCH b ON b.COMPLAINT_ID = s.COMPLAINT_ID
+  CROSS JOIN (
+    SELECT ROW_NUMBER() OVER (ORDER BY SEQ4()) - 1 as BAND_ID
+    FROM TABLE(GENERATOR(ROWCOUNT => 16))
+  ) bands;
+
+  -- Candidate edges inside the batch (symmetric, includes self-pairs)
+  INSERT INTO LSH_BATCH_EDGE
+  SELECT DISTINCT n.COMPLAINT_ID as SRC_ID, m.COMPLAINT_ID as DST_ID
+  FROM LSH_BUCKET_BATCH n
+  JOIN LSH_BUCKET_BATCH m
+    ON m.BAND_ID = n.BAND_ID
+    AND m.BUCKET_HASH = n.BUCKET_HASH
+    AND m.COMPLAINT_TIMESTAMP BETWEEN DATEADD(hour, -1 * :MATCH_WINDOW_HOURS, n.COMPLAINT_TIMESTAMP)
+                                  AND DATEADD(hour, :MATCH_WINDOW_HOURS, n.COMPLAINT_TIMESTAMP);
+
+  -- Connected components by min-label propagation
+  INSERT INTO LSH_COMPONENT
+  SELECT COMPLAINT_ID, COMPLAINT_ID as COMPONENT_ID
+  FROM LSH_SIGNATURE_BATCH;
+
+  WHILE (labels_changed > 0 AND label_passes < 50) DO
+    UPDATE LSH_COMPONENT c
+    SET COMPONENT_ID = x.MIN_LABEL
+    FROM (
+      SELECT e.SRC_ID, MIN(l.COMPONENT_ID) as MIN_LABEL
+      FROM LSH_BATCH_EDGE e
+      JOIN LSH_COMPONENT l ON l.COMPLAINT_ID = e.DST_ID
+      GROUP BY e.SRC_ID
+    ) x
+    WHERE c.COMPLAINT_ID = x.SRC_ID
+      AND x.MIN_LABEL < c.COMPONENT_ID;
+    labels_changed := SQLROWCOUNT;
+    label_passes := label_passes + 1;
+  END WHILE;
+
+  -- Cluster assignment: a component keeps the earliest existing cluster any member
+  -- matches, else gets a new cluster seeded by its earliest member
+  INSERT INTO LSH_ASSIGNMENT
+  WITH existing_matches AS (
+    SELECT
+      n.COMPLAINT_ID,
+      MIN_BY(e.CLUSTER_ID, e.COMPLAINT_TIMESTAMP) as CLUSTER_ID,
+      MIN(e.COMPLAINT_TIMESTAMP) as MATCHED_TIMESTAMP
+    FROM LSH_BUCKET_BATCH n
+    JOIN ANALYTICS.COMPLAINT_LSH_BUCKET e
+      ON e.BAND_ID = n.BAND_ID
+      AND e.BUCKET_HASH = n.BUCKET_HASH
+      AND e.COMPLAINT_TIMESTAMP BETWEEN DATEADD(hour, -1 * :MATCH_WINDOW_HOURS, n.COMPLAINT_TIMESTAMP)
+                                    AND DATEADD(hour, :MATCH_WINDOW_HOURS, n.COMPLAINT_TIMESTAMP)
+    GROUP BY n.COMPLAINT_ID
+  ),
+  components AS (
+    SELECT
+      c.COMPONENT_ID,
+      MIN_BY(em.CLUSTER_ID, em.MATCHED_TIMESTAMP) as EXISTING_CLUSTER_ID,
+      MIN_BY(c.COMPLAINT_ID, b.COMPLAINT_TIMESTAMP) as SEED_COMPLAINT_ID
+    FROM LSH_COMPONENT c
+    JOIN LSH_COMPLAINT_BATCH b ON b.COMPLAINT_ID = c.COMPLAINT_ID
+    LEFT JOIN existing_matches em ON em.COMPLAINT_ID = c.COMPLAINT_ID
+    GROUP BY c.COMPONENT_ID
+  )
+  SELECT
+    c.COMPLAINT_ID,
+    COALESCE(k.EXISTING_CLUSTER_ID, 'CLU-' || SUBSTR(MD5(k.SEED_COMPLAINT_ID), 1, 16)) as CLUSTER_ID,
+    k.EXISTING_CLUSTER_ID IS NOT NULL as JOINED_EXISTING
+  FROM LSH_COMPONENT c
+  JOIN components k ON k.COMPONENT_ID = c.COMPONENT_ID;
+
+  joined_existing := (SELECT COUNT_IF(JOINED_EXISTING) FROM LSH_ASSIGNMENT);
+
+  INSERT INTO ANALYTICS.COMPLAINT_MINHASH (
+    COMPLAINT_ID, CHANNEL, COMPLAINT_TIMESTAMP, SIGNATURE, CLUSTER_ID, CREATED_DATE
+  )
+  SELECT b.COMPLAINT_ID, b.CHANNEL, b.COMPLAINT_TIMESTAMP, s.SIGNATURE, a.CLUSTER_ID, CURRENT_TIMESTAMP()
+  FROM LSH_SIGNATURE_BATCH s
+  JOIN LSH_COMPLAINT_BATCH b ON b.COMPLAINT_ID = s.COMPLAINT_ID
+  JOIN LSH_ASSIGNMENT a ON a.COMPLAINT_ID = s.COMPLAINT_ID;
+
+  INSERT INTO ANALYTICS.COMPLAINT_LSH_BUCKET (
+    BAND_ID, BUCKET_HASH, COMPLAINT_ID, COMPLAINT_TIMESTAMP, CLUSTER_ID
+  )
+  SELECT n.BAND_ID, n.BUCKET_HASH, n.COMPLAINT_ID, n.COMPLAINT_TIMESTAMP, a.CLUSTER_ID
+  FROM LSH_BUCKET_BATCH n
+  JOIN LSH_ASSIGNMENT a ON a.COMPLAINT_ID = n.COMPLAINT_ID;
+
+  -- Refresh summaries for touched clusters only
+  MERGE INTO ANALYTICS.COMPLAINT_CLUSTER t
+  USING (
+    SELECT
+      m.CLUSTER_ID,
+      MIN_BY(m.COMPLAINT_ID, m.COMPLAINT_TIMESTAMP) as REPRESENTATIVE_COMPLAINT_ID,
+      SUBSTR(MIN_BY(c.COMPLAINT_TEXT, c.COMPLAINT_TIMESTAMP), 1, 500) as REPRESENTATIVE_TEXT,
+      MODE(c.CATEGORY) as TOP_CATEGORY,
+      COUNT(*) as MEMBER_COUNT,
+      COUNT(DISTINCT m.CHANNEL) as CHANNEL_COUNT,
+      LISTAGG(DISTINCT m.CHANNEL, ', ') WITHIN GROUP (ORDER BY m.CHANNEL) as CHANNELS,
+      MIN(m.COMPLAINT_TIMESTAMP) as FIRST_SEEN,
+      MAX(m.COMPLAINT_TIMESTAMP) as LAST_SEEN
+    FROM ANALYTICS.COMPLAINT_MINHASH m
+    JOIN COMPLAINTS.UNIFIED_COMPLAINT c ON c.COMPLAINT_ID = m.COMPLAINT_ID
+    WHERE m.CLUSTER_ID IN (SELECT DISTINCT CLUSTER_ID FROM LSH_ASSIGNMENT)
+    GROUP BY m.CLUSTER_ID
+  ) s
+  ON t.CLUSTER_ID = s.CLUSTER_ID
+  WHEN MATCHED THEN UPDATE SET
+    REPRESENTATIVE_COMPLAINT_ID = s.REPRESENTATIVE_COMPLAINT_ID,
+    REPRESENTATIVE_TEXT = s.REPRESENTATIVE_TEXT,
+    TOP_CATEGORY = s.TOP_CATEGORY,
+    MEMBER_COUNT = s.MEMBER_COUNT,
+    CHANNEL_COUNT = s.CHANNEL_COUNT,
+    CHANNELS = s.CHANNELS,
+    FIRST_SEEN = s.FIRST_SEEN,
+    LAST_SEEN = s.LAST_SEEN,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (
+    CLUSTER_ID, REPRESENTATIVE_COMPLAINT_ID, REPRESENTATIVE_TEXT, TOP_CATEGORY, MEMBER_COUNT,
+    CHANNEL_COUNT, CHANNELS, FIRST_SEEN, LAST_SEEN, UPDATED_AT
+  ) VALUES (
+    s.CLUSTER_ID, s.REPRESENTATIVE_COMPLAINT_ID, s.REPRESENTATIVE_TEXT, s.TOP_CATEGORY, s.MEMBER_COUNT,
+    s.CHANNEL_COUNT, s.CHANNELS, s.FIRST_SEEN, s.LAST_SEEN, CURRENT_TIMESTAMP()
+  );
+
+  clusters_updated := SQLROWCOUNT;
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+    RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
+  )
+  SELECT
+    UUID_STRING(),
+    'UPDATE_COMPLAINT_CLUSTERS',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :new_complaints,
+    OBJECT_CONSTRUCT(
+      'signed_complaints', :signed_complaints,
+      'joined_existing_cluster', :joined_existing,
+      'clusters_updated', :clusters_updated,
+      'label_passes', :label_passes
+    );
+
+  RETURN 'Complaint clusters updated: ' || signed_complaints || ' complaints signed, ' ||
+         joined_existing || ' joined existing clusters, ' || clusters_updated || ' clusters refreshed';
+END;
+$$;
+
+-- =====================================================================
+-- SECTION 3: INCREMENTAL PIPELINE (STREAM & TASK)
+-- =====================================================================
+
+SELECT 'Creating clustering stream and task...' as STATUS;
+
+-- SHOW_INITIAL_ROWS makes the first run backfill every existing complaint
+CREATE STREAM IF NOT EXISTS COMPLAINTS.UNIFIED_COMPLAINT_LSH_STREAM
+    ON TABLE COMPLAINTS.UNIFIED_COMPLAINT
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE
+    COMMENT = 'New complaints pending near-duplicate clustering';
+
+-- Initial backfill
+CALL ANALYTICS.UPDATE_COMPLAINT_CLUSTERS();
+
+CREATE OR REPLACE TASK ANALYTICS.COMPLAINT_CLUSTER_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '5 MINUTE'
+    COMMENT = 'Incremental near-duplicate clustering of new complaints'
+    WHEN SYSTEM$STREAM_HAS_DATA('COMPLAINTS.UNIFIED_COMPLAINT_LSH_STREAM')
+AS
+    CALL ANALYTICS.UPDATE_COMPLAINT_CLUSTERS();
+
+ALTER TASK ANALYTICS.COMPLAINT_CLUSTER_TASK RESUME;
+
+-- =====================================================================
+-- SECTION 4: SEMANTIC SEARCH SERVICE (CORTEX SEARCH)
+-- =====================================================================
+
+SELECT 'Creating semantic complaint search service...' as STATUS;
+
+-- Cortex Search embeds COMPLAINT_TEXT and maintains the vector (ANN) index;
+-- new and changed complaints are embedded incrementally within TARGET_LAG
+ALTER TABLE COMPLAINTS.UNIFIED_COMPLAINT SET CHANGE_TRACKING = TRUE;
+
+CREATE OR REPLACE CORTEX SEARCH SERVICE ANALYTICS.COMPLAINT_SEARCH_SERVICE
+    ON COMPLAINT_TEXT
+    ATTRIBUTES CHANNEL, CATEGORY, PRIORITY, STATUS
+    WAREHOUSE = COMPUTE_WH
+    TARGET_LAG = '5 minutes'
+    EMBEDDING_MODEL = 'snowflake-arctic-embed-m-v1.5'
+    COMMENT = 'Semantic search over complaint text (similar past complaints)'
+AS (
+    SELECT
+        COMPLAINT_ID,
+        CUSTOMER_ID,
+        CHANNEL,
+        CATEGORY,
+        PRIORITY,
+        STATUS,
+        COMPLAINT_TIMESTAMP::VARCHAR as COMPLAINT_TIMESTAMP,
+        COMPLAINT_TEXT
+    FROM COMPLAINTS.UNIFIED_COMPLAINT
+    WHERE COMPLAINT_TEXT IS NOT NULL
+);
+
+-- =====================================================================
+-- SECTION 5: KEYWORD SEARCH INDEX (INVERTED INDEX + BM25)
+-- =====================================================================
+
+SELECT 'Creating keyword search index...' as STATUS;
+
+-- One row per indexed text (complaint, call, email, chat or social post)
+CREATE TABLE IF NOT EXISTS SEARCH_DOCUMENT (
+    DOC_ID VARCHAR(100) PRIMARY KEY, -- SOURCE:SOURCE_ID
+    SOURCE VARCHAR(50) NOT NULL, -- UNIFIED_COMPLAINT, VOICE_TRANSCRIPT, EMAIL_COMPLAINT, CHAT_SESSION, SOCIAL_MEDIA_POST
+    SOURCE_ID VARCHAR(50) NOT NULL,
+    CUSTOMER_ID VARCHAR(50),
+    DOC_TIMESTAMP TIMESTAMP_NTZ,
+    DOC_LENGTH INT, -- Indexed terms (after stopword removal)
+    PREVIEW VARCHAR(300),
+    INDEXED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+) COMMENT = 'Documents in the keyword search index';
+
+-- Positional postings: term -> document, frequency and token positions
+CREATE TABLE IF NOT EXISTS SEARCH_POSTING (
+    TERM VARCHAR(100) NOT NULL,
+    DOC_ID VARCHAR(100) NOT NULL,
+    TERM_FREQ INT NOT NULL,
+    POSITIONS ARRAY
+)
+CLUSTER BY (TERM)
+COMMENT = 'Inverted index postings for keyword search';
+
+CREATE TABLE IF NOT EXISTS SEARCH_TERM_STATS (
+    TERM VARCHAR(100) PRIMARY KEY,
+    DOC_FREQ INT NOT NULL
+) COMMENT = 'Document frequency per term (BM25 IDF)';
+
+CREATE TABLE IF NOT EXISTS SEARCH_INDEX_STATS (
+    DOC_COUNT INT,
+    TOTAL_DOC_LENGTH INT,
+    UPDATED_AT TIMESTAMP_NTZ
+) COMMENT = 'Corpus size and total length (BM25 average document length)';
+
+-- Procedure to index new rows from the five text sources
+CREATE OR REPLACE PROCEDURE UPDATE_SEARCH_INDEX()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+  run_started TIMESTAMP_NTZ;
+  new_documents INT;
+  new_postings INT;
+BEGIN
+  run_started := CURRENT_TIMESTAMP();
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS SEARCH_DOC_BATCH (
+    DOC_ID VARCHAR(100),
+    SOURCE VARCHAR(50),
+    SOURCE_ID VARCHAR(50),
+    CUSTOMER_ID VARCHAR(50),
+    DOC_TIMESTAMP TIMESTAMP_NTZ,
+    DOC_TEXT TEXT
+  );
+  TRUNCATE TABLE SEARCH_DOC_BATCH;
+
+  CREATE TEMPORARY TABLE IF NOT EXISTS SEARCH_TOKEN_BATCH (
+    DOC_ID VARCHAR(100),
+    POSITION INT,
+    TERM VARCHAR(100)
+  );
+  TRUNCATE TABLE SEARCH_TOKEN_BATCH;
+
+  BEGIN TRANSACTION;
+
+  -- A single statement consumes all five streams together; it commits with the
+  -- index writes below so postings, documents and term stats stay in step
+  INSERT INTO SEARCH_DOC_BATCH
+  SELECT 'UNIFIED_COMPLAINT:' || COMPLAINT_ID, 'UNIFIED_COMPLAINT', COMPLAINT_ID, CUSTOMER_ID, COMPLAINT_TIMESTAMP, COMPLAINT_TEXT
+  FROM COMPLAINTS.UNIFIED_COMPLAINT_SEARCH_STREAM WHERE METADATA$ACTION = 'INSERT'
+  UNION ALL
+  SELECT 'VOICE_TRANSCRIPT:' || CALL_ID, 'VOICE_TRANSCRIPT', CALL_ID, CUSTOMER_ID, CALL_TIMESTAMP, TRANSCRIPT_TEXT
+  FROM COMPLAINTS.VOICE_TRANSCRIPT_SEARCH_STREAM WHERE METADATA$ACTION = 'INSERT'
+  UNION ALL
+  SELECT 'EMAIL_COMPLAINT:' || EMAIL_ID, 'EMAIL_COMPLAINT', EMAIL_ID, CUSTOMER_ID, RECEIVED_TIMESTAMP,
+         COALESCE(SUBJECT, '') || ' ' || COALESCE(BODY_TEXT, '')
+  FROM COMPLAINTS.EMAIL_COMPLAINT_SEARCH_STREAM WHERE METADATA$ACTION = 'INSERT'
+  UNION ALL
+  SELECT 'CHAT_SESSION:' || SESSION_ID, 'CHAT_SESSION', SESSION_ID, CUSTOMER_ID, START_TIMESTAMP, TRANSCRIPT_TEXT
+  FROM COMPLAINTS.CHAT_SESSION_SEARCH_STREAM WHERE METADATA$ACTION = 'INSERT'
+  UNION ALL
+  SELECT 'SOCIAL_MEDIA_POST:' || POST_ID, 'SOCIAL_MEDIA_POST', POST_ID, CUSTOMER_ID, POST_TIMESTAMP, POST_TEXT
+  FROM COMPLAINTS.SOCIAL_MEDIA_POST_SEARCH_STREAM WHERE METADATA$ACTION = 'INSERT';
+
+  new_documents := SQLROWCOUNT;
+
+  -- Tokenize: lowercase alphanumeric terms, stopwords dropped, positions kept
+  INSERT INTO SEARCH_TOKEN_BATCH
+  SELECT
+    b.DOC_ID,
+    t.INDEX as POSITION,
+    t.VALUE as TERM
+  FROM SEARCH_DOC_BATCH b,
+  LATERAL SPLIT_TO_TABLE(TRIM(REGEXP_REPLACE(LOWER(b.DOC_TEXT), '[^a-z0-9]+', ' ')), ' ') t
+  WHERE b.DOC_TEXT IS NOT NULL
+    AND LENGTH(t.VALUE) BETWEEN 2 AND 100
+    AND t.VALUE NOT IN ('the', 'and', 'to', 'of', 'in', 'is', 'it', 'for', 'on', 'my', 'me', 'that', 'this',
+                        'was', 'with', 'be', 'have', 'has', 'at', 'as', 'are', 'you', 'your', 'we', 'an',
+                        'or', 'but', 'so', 'if', 'do', 'can', 'am', 'been', 'from', 'will', 'would', 'there');
+
+  INSERT INTO ANALYTICS.SEARCH_POSTING (TERM, DOC_ID, TERM_FREQ, POSITIONS)
+  SELECT
+    TERM,
+    DOC_ID,
+    COUNT(*) as TERM_FREQ,
+    ARRAY_AGG(POSITION) WITHIN GROUP (ORDER BY POSITION) as POSITIONS
+  FROM SEARCH_TOKEN_BATCH
+  GROUP BY TERM, DOC_ID;
+
+  new_postings := SQLROWCOUNT;
+
+  INSERT INTO ANALYTICS.SEARCH_DOCUMENT (
+    DOC_ID, SOURCE, SOURCE_ID, CUSTOMER_ID, DOC_TIMESTAMP, DOC_LENGTH, PREVIEW, INDEXED_AT
+  )
+  SELECT
+    b.DOC_ID,
+    b.SOURCE,
+    b.SOURCE_ID,
+    b.CUSTOMER_ID,
+    b.DOC_TIMESTAMP,
+    COALESCE(l.DOC_LENGTH, 0),
+    SUBSTR(b.DOC_TEXT, 1, 300),
+    CURRENT_TIMESTAMP()
+  FROM SEARCH_DOC_BATCH b
+  LEFT JOIN (
+    SELECT DOC_ID, COUNT(*) as DOC_LENGTH FROM SEARCH_TOKEN_BATCH GROUP BY DOC_ID
+  ) l ON l.DOC_ID = b.DOC_ID;
+
+  MERGE INTO ANALYTICS.SEARCH_TERM_STATS t
+  USING (
+    SELECT TERM, COUNT(DISTINCT DOC_ID) as NEW_DOCS
+    FROM SEARCH_TOKEN_BATCH
+    GROUP BY TERM
+  ) s
+  ON t.TERM = s.TERM
+  WHEN MATCHED THEN UPDATE SET DOC_FREQ = t.DOC_FREQ + s.NEW_DOCS
+  WHEN NOT MATCHED THEN INSERT (TERM, DOC_FREQ) VALUES (s.TERM, s.NEW_DOCS);
+
+  UPDATE ANALYTICS.SEARCH_INDEX_STATS
+  SET DOC_COUNT = DOC_COUNT + :new_documents,
+      TOTAL_DOC_LENGTH = TOTAL_DOC_LENGTH + (SELECT COUNT(*) FROM SEARCH_TOKEN_BATCH),
+      UPDATED_AT = CURRENT_TIMESTAMP();
+
+  IF (SQLROWCOUNT = 0) THEN
+    INSERT INTO ANALYTICS.SEARCH_INDEX_STATS (DOC_COUNT, TOTAL_DOC_LENGTH, UPDATED_AT)
+    SELECT :new_documents, (SELECT COUNT(*) FROM SEARCH_TOKEN_BATCH), CURRENT_TIMESTAMP();
+  END IF;
+
+  COMMIT;
+
+  INSERT INTO SENTIMENT.PIPELINE_RUN_LOG (
+    RUN_ID, PIPELINE_NAME, STARTED_AT, FINISHED_AT, DURATION_MS, ROWS_PROCESSED, DETAILS
+  )
+  SELECT
+    UUID_STRING(),
+    'UPDATE_SEARCH_INDEX',
+    :run_started,
+    CURRENT_TIMESTAMP(),
+    DATEDIFF(millisecond, :run_started, CURRENT_TIMESTAMP()),
+    :new_documents,
+    OBJECT_CONSTRUCT('new_postings', :new_postings);
+
+  RETURN 'Search index updated: ' || new_documents || ' documents, ' || new_postings || ' postings added';
+END;
+$$;
+
+-- BM25 keyword search (k1 = 1.2, b = 0.75) over the inverted index
+-- SOURCE_FILTER (e.g. 'CHAT_SESSION') restricts documents before the TOP_K cut
+-- Usage: SELECT * FROM TABLE(ANALYTICS.SEARCH_COMPLAINTS('dropped calls refund', 20));
+--        SELECT * FROM TABLE(ANALYTICS.SEARCH_COMPLAINTS('dropped calls refund', 20, 'EMAIL_COMPLAINT'));
+DROP FUNCTION IF EXISTS SEARCH_COMPLAINTS(VARCHAR, INT);
+CREATE OR REPLACE FUNCTION SEARCH_COMPLAINTS(QUERY_TEXT VARCHAR, TOP_K INT, SOURCE_FILTER VARCHAR DEFAULT NULL)
+RETURNS TABLE (
+    DOC_ID VARCHAR,
+    SOURCE VARCHAR,
+    SOURCE_ID VARCHAR,
+    CUSTOMER_ID VARCHAR,
+    DOC_TIMESTAMP TIMESTAMP_NTZ,
+    PREVIEW VARCHAR,
+    MATCHED_TERMS NUMBER,
+    SCORE FLOAT
+)
+AS
+$$
+    WITH query_terms AS (
+        SELECT DISTINCT VALUE as TERM
+        FROM TABLE(SPLIT_TO_TABLE(TRIM(REGEXP_REPLACE(LOWER(QUERY_TEXT), '[^a-z0-9]+', ' ')), ' '))
+        WHERE LENGTH(VALUE) >= 2
+    ),
+    corpus AS (
+        SELECT DOC_COUNT, TOTAL_DOC_LENGTH / NULLIF(DOC_COUNT, 0) as AVG_DOC_LENGTH
+        FROM ANALYTICS.SEARCH_INDEX_STATS
+    ),
+    scored AS (
+        SELECT
+            p.DOC_ID,
+            COUNT(*) as MATCHED_TERMS,
+            SUM(
+                LN(1 + (c.DOC_COUNT - ts.DOC_FREQ + 0.5) / (ts.DOC_FREQ + 0.5)) *
+                (p.TERM_FREQ * 2.2) /
+                (p.TERM_FREQ + 1.2 * (0.25 + 0.75 * d.DOC_LENGTH / c.AVG_DOC_LENGTH))
+            ) as SCORE
+        FROM query_terms q
+        JOIN ANALYTICS.SEARCH_POSTING p ON p.TERM = q.TERM
+        JOIN ANALYTICS.SEARCH_TERM_STATS ts ON ts.TERM = q.TERM
+        JOIN ANALYTICS.SEARCH_DOCUMENT d ON d.DOC_ID = p.DOC_ID
+        CROSS JOIN corpus c
+        WHERE SOURCE_FILTER IS NULL OR d.SOURCE = SOURCE_FILTER
+        GROUP BY p.DOC_ID
+    )
+    SELECT
+        d.DOC_ID,
+        d.SOURCE,
+        d.SOURCE_ID,
+        d.CUSTOMER_ID,
+        d.DOC_TIMESTAMP,
+        d.PREVIEW,
+        s.MATCHED_TERMS,
+        ROUND(s.SCORE, 4) as SCORE
+    FROM scored s
+    JOIN ANALYTICS.SEARCH_DOCUMENT d ON d.DOC_ID = s.DOC_ID
+    QUALIFY ROW_NUMBER() OVER (ORDER BY s.SCORE DESC) <= TOP_K
+$$;
+
+-- Streams on each text source (first run backfills existing rows)
+CREATE STREAM IF NOT EXISTS COMPLAINTS.UNIFIED_COMPLAINT_SEARCH_STREAM
+    ON TABLE COMPLAINTS.UNIFIED_COMPLAINT APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+CREATE STREAM IF NOT EXISTS COMPLAINTS.VOICE_TRANSCRIPT_SEARCH_STREAM
+    ON TABLE COMPLAINTS.VOICE_TRANSCRIPT APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+CREATE STREAM IF NOT EXISTS COMPLAINTS.EMAIL_COMPLAINT_SEARCH_STREAM
+    ON TABLE COMPLAINTS.EMAIL_COMPLAINT APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+CREATE STREAM IF NOT EXISTS COMPLAINTS.CHAT_SESSION_SEARCH_STREAM
+    ON TABLE COMPLAINTS.CHAT_SESSION APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+CREATE STREAM IF NOT EXISTS COMPLAINTS.SOCIAL_MEDIA_POST_SEARCH_STREAM
+    ON TABLE COMPLAINTS.SOCIAL_MEDIA_POST APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+
+-- Initial backfill
+CALL ANALYTICS.UPDATE_SEARCH_INDEX();
+
+CREATE OR REPLACE TASK ANALYTICS.SEARCH_INDEX_TASK
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '5 MINUTE'
+    COMMENT = 'Incremental keyword search indexing of new complaint text'
+    WHEN SYSTEM$STREAM_HAS_DATA('COMPLAINTS.UNIFIED_COMPLAINT_SEARCH_STREAM')
+      OR SYSTEM$STREAM_HAS_DATA('COMPLAINTS.VOICE_TRANSCRIPT_SEARCH_STREAM')
+      OR SYSTEM$STREAM_HAS_DATA('COMPLAINTS.EMAIL_COMPLAINT_SEARCH_STREAM')
+      OR SYSTEM$STREAM_HAS_DATA('COMPLAINTS.CHAT_SESSION_SEARCH_STREAM')
+      OR SYSTEM$STREAM_HAS_DATA('COMPLAINTS.SOCIAL_MEDIA_POST_SEARCH_STREAM')
+AS
+    CALL ANALYTICS.UPDATE_SEARCH_INDEX();
+
+ALTER TASK ANALYTICS.SEARCH_INDEX_TASK RESUME;
+
+-- =====================================================================
+-- SECTION 6: SUMMARY
+-- =====================================================================
+
+SELECT '===========================================================' as SUMMARY
+UNION ALL SELECT 'TEXT INDEXES COMPLETE!'
+UNION ALL SELECT '==========================================================='
+UNION ALL SELECT ''
+UNION ALL SELECT 'Near-Duplicate Clustering:'
+UNION ALL SELECT '  - Signed Complaints: ' || (SELECT COUNT(*) FROM ANALYTICS.COMPLAINT_MINHASH)
+UNION ALL SELECT '  - Clusters: ' || (SELECT COUNT(*) FROM ANALYTICS.COMPLAINT_CLUSTER)
+UNION ALL SELECT '  - Storm Clusters (5+ members): ' || (SELECT COUNT(*) FROM ANALYTICS.COMPLAINT_CLUSTER WHERE MEMBER_COUNT >= 5)
+UNION ALL SELECT '  - Clustering Task: COMPLAINT_CLUSTER_TASK (every 5 minutes)'
+UNION ALL SELECT ''
+UNION ALL SELECT 'Semantic Search:'
+UNION ALL SELECT '  - Service: ANALYTICS.COMPLAINT_SEARCH_SERVICE (target lag 5 minutes)'
+UNION ALL SELECT ''
+UNION ALL SELECT 'Keyword Search (BM25):'
+UNION ALL SELECT '  - Indexed Documents: ' || (SELECT COUNT(*) FROM ANALYTICS.SEARCH_DOCUMENT)
+UNION ALL SELECT '  - Distinct Terms: ' || (SELECT COUNT(*) FROM ANALYTICS.SEARCH_TERM_STATS)
+UNION ALL SELECT '  - Indexing Task: SEARCH_INDEX_TASK (every 5 minutes)'
+UNION ALL SELECT ''
+UNION ALL SELECT '===========================================================';
+
+-- Largest clusters
+SELECT
+    CLUSTER_ID,
+    MEMBER_COUNT,
+    CHANNELS,
+    TOP_CATEGORY,
+    FIRST_SEEN,
+    LAST_SEEN,
+    SUBSTR(REPRESENTATIVE_TEXT, 1, 120) as SAMPLE_TEXT
+FROM ANALYTICS.COMPLAINT_CLUSTER
+ORDER BY MEMBER_COUNT DESC
+LIMIT 10;
+
+-- Sample semantic search
+SELECT
+    r.value:COMPLAINT_ID::VARCHAR as COMPLAINT_ID,
+    r.value:CHANNEL::VARCHAR as CHANNEL,
+    r.value:CATEGORY::VARCHAR as CATEGORY,
+    SUBSTR(r.value:COMPLAINT_TEXT::VARCHAR, 1, 120) as SAMPLE_TEXT
+FROM TABLE(FLATTEN(PARSE_JSON(SNOWFLAKE.CORTEX.SEARCH_PREVIEW(
+    'UC3_CUSTOMER_COMPLAINTS.ANALYTICS.COMPLAINT_SEARCH_SERVICE',
+    '{"query": "internet keeps dropping during video calls", "columns": ["COMPLAINT_ID", "CHANNEL", "CATEGORY", "COMPLAINT_TEXT"], "limit": 5}'
+)):results)) r;